@@ -1,5 +1,14 @@
-from .binance import scrape_binance
-from .okx import scrape_okx
-from .bitget import scrape_bitget
+import importlib
 
-__all__ = ["scrape_binance", "scrape_okx", "scrape_bitget"]
+from .registry import Source, discover_sources, get_source, select_sources
+
+__all__ = ["Source", "discover_sources", "get_source", "select_sources"]
+
+
+def __getattr__(name):
+    """按需导入爬虫函数 (如 scrape_binance)，避免启动时就加载 playwright"""
+    for source in discover_sources():
+        if name == source.entry or name in source.strategies.values():
+            module = importlib.import_module(f".{source.module}", __name__)
+            return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,238 @@
+"""
+自适应抓取频率
+
+每个数据源的变化频率差别很大，统一按 cron 全量抓取会浪费大量浏览器时间。
+这里按历史抓取结果估计每个数据源的变化率，决定下一次抓取时间:
+
+1. 用最近 MAX_OBSERVATIONS 次观察 (距上次观察的时长, 是否有变化) 估计泊松变化率
+2. 下次抓取间隔取 "这段时间内发生变化的概率约为 TARGET_CHANGE_PROBABILITY"，
+   限制在 [MIN_INTERVAL, MAX_INTERVAL] 之间；抓取失败后按最短间隔重试
+3. 到期的数据源如果声明了 probe 地址 (SOURCE["probe"])，先发一个带 ETag / Last-Modified
+   的条件请求或比较响应指纹，没变化就跳过本次全量抓取；距上次全量抓取超过 MAX_INTERVAL 时不探测
+
+状态保存在 .cache/crawl_state.json，跨运行复用。
+"""
+import hashlib
+import json
+import math
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .browser import DEFAULT_USER_AGENT
+from .jobset import job_id
+
+
+# 两次全量抓取之间的最短 / 最长间隔 (秒)
+MIN_INTERVAL = 3 * 3600
+MAX_INTERVAL = 72 * 3600
+
+# 希望每次抓取时有变化的概率
+TARGET_CHANGE_PROBABILITY = 0.4
+
+# 估计变化率用的最近观察次数和先验时长 (小时)
+MAX_OBSERVATIONS = 20
+PRIOR_HOURS = 24.0
+
+# 定时任务的触发时间有误差，提前这么久到期的也算到期 (秒)
+DUE_SLACK = 15 * 60
+
+PROBE_TIMEOUT = 20
+
+
+def jobs_fingerprint(jobs: List[Dict]) -> str:
+    """职位集合的指纹，只看职位 ID，不受顺序影响"""
+    ids = sorted(job_id(job) for job in jobs)
+    return hashlib.sha1("\n".join(ids).encode("utf-8")).hexdigest()[:16]
+
+
+def estimate_rate(observations: List[Tuple[float, bool]]) -> float:
+    """
+    估计每小时的变化率，observations 为 (距上次观察的小时数, 是否有变化)
+
+    一次观察里可能发生过多次变化，只知道 "有没有"，所以按区间删失的泊松过程求最大似然:
+    sum_changed h * e^(-λh) / (1 - e^(-λh)) = sum_unchanged h，左边随 λ 单调递减，二分求解。
+    另加一次 "有变化" 和一次 "无变化" 的 PRIOR_HOURS 先验观察，保证解存在且样本少时不极端。
+    """
+    observations = list(observations) + [(PRIOR_HOURS, True), (PRIOR_HOURS, False)]
+    changed = [h for h, c in observations if c and h > 0]
+    unchanged = sum(h for h, c in observations if not c)
+
+    def excess(rate: float) -> float:
+        return sum(h / math.expm1(rate * h) for h in changed) - unchanged
+
+    low, high = 1e-5, 10.0
+    for _ in range(60):
+        mid = math.sqrt(low * high)
+        if excess(mid) > 0:
+            low = mid
+        else:
+            high = mid
+    return math.sqrt(low * high)
+
+
+def next_interval(
+    observations: List[Tuple[float, bool]],
+    min_interval: float = MIN_INTERVAL,
+    max_interval: float = MAX_INTERVAL,
+) -> float:
+    """按泊松过程取 P(间隔内有变化) = TARGET_CHANGE_PROBABILITY 的间隔 (秒)"""
+    rate = estimate_rate(observations)
+    hours = -math.log(1 - TARGET_CHANGE_PROBABILITY) / rate
+    return min(max(hours * 3600, min_interval), max_interval)
+
+
+class CrawlPlanner:
+    """记录各数据源的抓取历史，决定本次要全量抓取哪些数据源"""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        min_interval: float = MIN_INTERVAL,
+        max_interval: float = MAX_INTERVAL,
+    ):
+        self.path = path
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.state: Dict[str, Dict] = {}
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, ValueError):
+                self.state = {}
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def entry(self, name: str) -> Dict:
+        return self.state.setdefault(name, {"observations": []})
+
+    def seconds_until_due(self, name: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        return max(0.0, self.entry(name).get("next_due", 0) - now)
+
+    async def probe(self, source, session) -> Optional[bool]:
+        """
+        条件请求探测数据源是否变化
+
+        返回 False 表示确定没变，True 表示有变化，None 表示无法判断 (未配置或请求失败)。
+        """
+        if not source.probe:
+            return None
+        entry = self.entry(source.name)
+        headers = {"User-Agent": DEFAULT_USER_AGENT}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            async with session.get(source.probe, headers=headers, timeout=PROBE_TIMEOUT) as resp:
+                if resp.status == 304:
+                    return False
+                if resp.status != 200:
+                    return None
+                body = await resp.read()
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+        except Exception:
+            return None
+
+        fingerprint = hashlib.sha1(body).hexdigest()[:16]
+        # 新的探测结果等全量抓取成功后再记下 (commit_probe)，抓取失败时下次仍会判断为有变化
+        entry["pending_probe"] = {"etag": etag, "last_modified": last_modified, "fingerprint": fingerprint}
+        return fingerprint != entry.get("probe_fingerprint")
+
+    def commit_probe(self, name: str):
+        entry = self.entry(name)
+        pending = entry.pop("pending_probe", None)
+        if pending:
+            entry["etag"] = pending["etag"]
+            entry["last_modified"] = pending["last_modified"]
+            entry["probe_fingerprint"] = pending["fingerprint"]
+
+    async def should_scrape(self, source, session=None, now: Optional[float] = None) -> Tuple[bool, str]:
+        """判断数据源本次是否需要全量抓取，返回 (是否抓取, 原因)"""
+        now = time.time() if now is None else now
+        entry = self.entry(source.name)
+
+        if "last_scrape" not in entry:
+            return True, "never scraped"
+        due_in = entry.get("next_due", 0) - now
+        if due_in > DUE_SLACK:
+            return False, f"next due in {due_in / 3600:.1f}h"
+        if now - entry["last_scrape"] >= self.max_interval:
+            return True, "max interval reached"
+        if session is None or not source.probe:
+            return True, "due"
+
+        changed = await self.probe(source, session)
+        if changed is False:
+            # 探测未变化也是一次 "没有变化" 的观察，间隔会随之拉长
+            entry["next_due"] = now + self.observe(entry, False, now)
+            return False, "probe unchanged"
+        return True, "probe changed" if changed else "due (probe failed)"
+
+    async def plan(self, sources, now: Optional[float] = None) -> Tuple[List, Dict[str, str]]:
+        """返回 (需要全量抓取的数据源, {数据源: 原因})，需要时创建临时 aiohttp 会话探测"""
+        now = time.time() if now is None else now
+        due, reasons = [], {}
+
+        session = None
+        try:
+            if any(source.probe for source in sources):
+                try:
+                    import aiohttp
+                    session = aiohttp.ClientSession()
+                except ImportError:
+                    session = None
+            for source in sources:
+                scrape, reasons[source.name] = await self.should_scrape(source, session, now)
+                if scrape:
+                    due.append(source)
+        finally:
+            if session is not None:
+                await session.close()
+        return due, reasons
+
+    def record(self, name: str, status: str, jobs: List[Dict], now: Optional[float] = None) -> float:
+        """记录一次全量抓取结果，返回下次抓取间隔 (秒)"""
+        now = time.time() if now is None else now
+        entry = self.entry(name)
+
+        if status != "ok":
+            entry.pop("pending_probe", None)
+            entry["last_error_at"] = now
+            entry["next_due"] = now + self.min_interval
+            return self.min_interval
+
+        fingerprint = jobs_fingerprint(jobs)
+        if "last_scrape" in entry:
+            changed = fingerprint != entry.get("jobs_fingerprint")
+            interval = self.observe(entry, changed, now)
+        else:
+            entry["last_change"] = now
+            entry["last_observed"] = now
+            interval = next_interval(entry["observations"], self.min_interval, self.max_interval)
+
+        self.commit_probe(name)
+        entry["jobs_fingerprint"] = fingerprint
+        entry["last_scrape"] = now
+        entry["next_due"] = now + interval
+        return interval
+
+    def observe(self, entry: Dict, changed: bool, now: float) -> float:
+        """追加一次观察 (距上次观察的时长, 是否变化)，返回新的抓取间隔"""
+        hours = (now - entry.get("last_observed", entry["last_scrape"])) / 3600
+        entry["observations"] = (entry["observations"] + [[round(hours, 3), changed]])[-MAX_OBSERVATIONS:]
+        entry["last_observed"] = now
+        if changed:
+            entry["last_change"] = now
+        return next_interval(entry["observations"], self.min_interval, self.max_interval)
@@ -0,0 +1,230 @@
+"""
+筛选与输出性能基准
+
+用法 (在仓库根目录):
+    python -m benchmarks.run                     # 1k 和 100k
+    python -m benchmarks.run --scale 1m          # 只跑 100 万条 (--scale 可重复)
+    python -m benchmarks.run --update-baseline   # 把本次结果设为基线
+
+对每个规模测量 filter / dedupe / json / html 四个阶段的耗时、吞吐、峰值内存和输出大小，
+--workers 指定进程数时另外测 filter_mp / html_mp 两个多进程阶段 (子进程内存不计入峰值)，
+安装了 NumPy 时另外测列式筛选 filter_col，
+结果写入 benchmarks/results/<时间>.json，并与 baseline.json 比较。
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic import generate_jobs
+from scraper import columnar
+from scraper.filters import filter_jobs
+from scraper.gazetteer import canonicalize_location
+from scraper.jobset import dedupe_jobs
+from scraper.parallel import filter_jobs_parallel, generate_html_parallel
+from scraper.render import generate_html
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SCALES = ["1k", "100k"]
+
+# 比基线慢超过该比例视为回归
+REGRESSION_THRESHOLD = 0.2
+
+
+def measure(func: Callable[[], Optional[int]], records: int, memory: bool = True) -> Dict:
+    """
+    先单独计时，再在 tracemalloc 下重跑一次取峰值内存
+    (tracemalloc 本身会拖慢执行，两者分开测)
+    """
+    gc.collect()
+    start = time.perf_counter()
+    output_bytes = func()
+    seconds = time.perf_counter() - start
+
+    result = {
+        "seconds": round(seconds, 4),
+        "records_per_sec": round(records / seconds) if seconds else None,
+    }
+    if output_bytes is not None:
+        result["output_bytes"] = output_bytes
+
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mb"] = round(peak / 1024 / 1024, 2)
+
+    return result
+
+
+def bench_scale(count: int, memory: bool = True, workers: Optional[int] = None) -> Dict:
+    """在一个数据规模上跑全部阶段"""
+    jobs = generate_jobs(count)
+    stages = {}
+    filtered: List[Dict] = []
+
+    def run_filter():
+        nonlocal filtered
+        # 每次都从冷缓存开始，避免第二遍测内存时命中 LRU
+        canonicalize_location.cache_clear()
+        filtered = filter_jobs(jobs)
+
+    stages["filter"] = measure(run_filter, count, memory)
+
+    if columnar.np is not None:
+        def run_filter_col():
+            canonicalize_location.cache_clear()
+            columnar.filter_jobs_columnar(jobs)
+
+        stages["filter_col"] = measure(run_filter_col, count, memory)
+
+    if workers:
+        def run_filter_mp():
+            filter_jobs_parallel(jobs, workers)
+
+        stages["filter_mp"] = measure(run_filter_mp, count, memory)
+
+    def run_dedupe():
+        dedupe_jobs(jobs)
+
+    stages["dedupe"] = measure(run_dedupe, count, memory)
+
+    def run_json():
+        payload = json.dumps({
+            "update_time": datetime.now().isoformat(),
+            "total_count": len(filtered),
+            "jobs": filtered,
+        }, ensure_ascii=False, indent=2)
+        return len(payload.encode("utf-8"))
+
+    stages["json"] = measure(run_json, len(filtered), memory)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        html_path = os.path.join(tmp, "index.html")
+
+        def run_html():
+            generate_html(filtered, html_path)
+            return os.path.getsize(html_path)
+
+        stages["html"] = measure(run_html, len(filtered), memory)
+
+        if workers:
+            def run_html_mp():
+                generate_html_parallel(filtered, html_path, workers)
+                return os.path.getsize(html_path)
+
+            stages["html_mp"] = measure(run_html_mp, len(filtered), memory)
+
+    return {"records": count, "matched": len(filtered), "stages": stages}
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """返回比基线慢超过阈值的阶段"""
+    regressions = []
+    for scale, result in current["results"].items():
+        base = baseline.get("results", {}).get(scale)
+        if not base:
+            continue
+        for stage, stats in result["stages"].items():
+            base_stats = base["stages"].get(stage)
+            if not base_stats or not base_stats["seconds"]:
+                continue
+            ratio = stats["seconds"] / base_stats["seconds"]
+            marker = ""
+            if ratio > 1 + threshold:
+                marker = "  <-- regression"
+                regressions.append(f"{scale}/{stage}")
+            print(f"  {scale:>5} {stage:<10} {base_stats['seconds']:>9.4f}s -> {stats['seconds']:>9.4f}s  x{ratio:.2f}{marker}")
+    return regressions
+
+
+def print_table(results: Dict):
+    print(f"{'scale':>5} {'stage':<10} {'seconds':>10} {'rec/s':>12} {'peak MB':>9} {'output':>12}")
+    for scale, result in results.items():
+        for stage, stats in result["stages"].items():
+            output = stats.get("output_bytes")
+            print(
+                f"{scale:>5} {stage:<10} {stats['seconds']:>10.4f} "
+                f"{stats['records_per_sec'] or 0:>12,} "
+                f"{stats.get('peak_mb', float('nan')):>9.2f} "
+                f"{output if output is not None else '-':>12}"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="filter_jobs / generate_html benchmarks")
+    parser.add_argument("--scale", action="append", choices=sorted(SCALES), help="数据规模 (可重复)")
+    parser.add_argument("--skip-memory", action="store_true", help="不测峰值内存 (省一半时间)")
+    parser.add_argument("--update-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--workers", type=int, metavar="N", help="同时测多进程阶段，使用 N 个进程")
+    parser.add_argument("--fail-on-regression", action="store_true", help="出现回归时返回非零退出码")
+    args = parser.parse_args(argv)
+
+    scales = args.scale or DEFAULT_SCALES
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "environment": environment(),
+        "results": {},
+    }
+    for scale in scales:
+        print(f"Running {scale} ({SCALES[scale]:,} jobs)...")
+        report["results"][scale] = bench_scale(SCALES[scale], memory=not args.skip_memory, workers=args.workers)
+
+    print()
+    print_table(report["results"])
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved: {path}")
+
+    regressions = []
+    if os.path.exists(BASELINE_PATH) and not args.update_baseline:
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"\nCompared with baseline ({baseline['environment'].get('commit') or baseline['created_at']}):")
+        regressions = compare(report, baseline)
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {BASELINE_PATH}")
+
+    if regressions and args.fail_on_regression:
+        print(f"\nRegressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
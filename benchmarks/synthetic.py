@@ -0,0 +1,104 @@
+"""
+合成职位数据
+
+按 jobs.json 中真实记录的形状生成中英文混合的职位，用于压测 filter_jobs / generate_html。
+同一个 seed 生成的数据完全一致，便于不同版本之间比较。
+"""
+import random
+import uuid
+from typing import Dict, Iterator, List
+
+
+COMPANIES = ["Binance", "OKX", "Bitget", "Bybit", "KuCoin", "Gate.io", "HashKey", "Crypto.com", "MEXC", "HTX"]
+
+# 地点分布大致参考真实数据: 大量空值 / 占位符，香港和新加坡居多，少量大陆城市和远程
+LOCATIONS = [
+    ("", 18), ("Not specified", 22),
+    ("Hong Kong, Hong Kong SAR", 10), ("Hong Kong", 6), ("HK", 2), ("香港", 2),
+    ("Singapore", 8), ("新加坡", 1), ("Taipei, Taiwan", 2), ("Tokyo, Japan", 1),
+    ("Dubai, United Arab Emirates", 2), ("Remote", 4), ("Remote - APAC", 2),
+    ("Shanghai, China", 3), ("Beijing", 2), ("深圳", 2), ("杭州", 1),
+    ("Kuala Lumpur, Malaysia", 1), ("London, United Kingdom", 1), ("Istanbul, Turkey", 1),
+    ("Detail-oriented, fast learner comfortable in a fast-paced remote environment.", 1),
+]
+
+ROLES = [
+    ("Back-end development", "后端开发"), ("Quantitative Researcher", "量化研究员"),
+    ("Product Manager", "产品经理"), ("Risk Control Analyst", "风控分析师"),
+    ("Visual Designer", "视觉设计师"), ("Operations Specialist", "运营专员"),
+    ("Java Engineer - Infrastructure", "Java工程师"), ("Compliance Officer", "合规官"),
+    ("Frontend Engineer", "前端工程师"), ("Marketing Specialist", "市场专员"),
+    ("Business Analyst", "商业分析师"), ("Security Engineer", "安全工程师"),
+]
+
+PREFIXES = [
+    ("", 60), ("Senior ", 12), ("Junior ", 5), ("[Graduate Program 26] ", 10),
+    ("Campus - ", 3), ("Intern - ", 4), ("Lead ", 6),
+]
+
+TEAMS = [
+    ("", 35), ("Engineering", 10), ("Operations", 8), ("Risk", 5), ("Compliance", 5),
+    ("Marketing", 5), ("Posted on 2025-09-15", 10), ("Posted on 2025-09-17", 5),
+    ("技术部", 3), ("University Recruitment", 2),
+]
+
+URL_PATTERNS = {
+    "Binance": "https://www.binance.com/en/careers/job?id={uuid}",
+    "OKX": "https://boards.greenhouse.io/okx/jobs/{num}",
+    "Bitget": "https://hire-r1.mokahr.com/social-recruitment/bitget/100004136#/job/{uuid}",
+}
+DEFAULT_URL = "https://careers.example.com/{company}/jobs/{uuid}"
+
+# 每条记录带编号后缀的地点比例，模拟 LRU 缓存未命中的长尾
+UNIQUE_LOCATION_RATIO = 0.02
+
+# 重复记录比例 (同标题同地点)，用于测试去重
+DUPLICATE_RATIO = 0.05
+
+
+def _weighted(rng: random.Random, items):
+    values, weights = zip(*items)
+    return lambda: rng.choices(values, weights)[0]
+
+
+def iter_jobs(count: int, seed: int = 42) -> Iterator[Dict]:
+    """逐条生成合成职位"""
+    rng = random.Random(seed)
+    pick_location = _weighted(rng, LOCATIONS)
+    pick_prefix = _weighted(rng, PREFIXES)
+    pick_team = _weighted(rng, TEAMS)
+    previous = None
+
+    for i in range(count):
+        if previous is not None and rng.random() < DUPLICATE_RATIO:
+            yield dict(previous)
+            continue
+
+        company = rng.choice(COMPANIES)
+        english, chinese = rng.choice(ROLES)
+        title = f"{pick_prefix()}{english}"
+        if rng.random() < 0.4:
+            title += f" {chinese}"
+
+        location = pick_location()
+        if location and rng.random() < UNIQUE_LOCATION_RATIO:
+            location = f"Office {i}, {location}"
+
+        job_uuid = uuid.UUID(int=rng.getrandbits(128), version=4)
+        url = URL_PATTERNS.get(company, DEFAULT_URL).format(
+            uuid=job_uuid, num=rng.randrange(10 ** 9, 10 ** 10), company=company.lower()
+        )
+
+        previous = {
+            "title": title,
+            "location": location,
+            "team": pick_team(),
+            "url": url,
+            "company": company,
+        }
+        yield previous
+
+
+def generate_jobs(count: int, seed: int = 42) -> List[Dict]:
+    """生成 count 条合成职位"""
+    return list(iter_jobs(count, seed))
@@ -3,23 +3,31 @@ Binance 招聘页面爬虫
 URL: https://www.binance.com/en/careers/job-openings
 """
 import asyncio
-from playwright.async_api import async_playwright
 from typing import List, Dict
 import re
 
+from .browser import collect_cards, count_matches, open_page
+from .gazetteer import looks_like_location
+from .jobset import dedupe_jobs
 
-async def scrape_binance() -> List[Dict]:
-    """抓取 Binance 招聘信息"""
+SOURCE = {
+    "name": "Binance",
+    "entry": "scrape_binance",
+    "strategies": {"browser": "scrape_binance"},
+    "requires": ["playwright"],
+    "budget": 240,
+    "order": 10,
+}
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+async def scrape_binance(browser=None) -> List[Dict]:
+    """抓取 Binance 招聘信息，传入 browser 时复用已启动的浏览器"""
     jobs = []
     url = "https://www.binance.com/en/careers/job-openings?team=All"
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-        page = await context.new_page()
-
+    async with open_page(browser, user_agent=USER_AGENT) as page:
         try:
             await page.goto(url, wait_until="domcontentloaded", timeout=60000)
 
@@ -35,45 +43,40 @@ async def scrape_binance() -> List[Dict]:
                 '[class*="position"]',
             ]
 
-            # 滚动加载所有职位
-            for _ in range(10):
+            # 列表是滚动后才渲染的，先滚动再选第一个有匹配的选择器；
+            # 最多滚动 10 次仍都没找到时取所有 careers 链接
+            selector = None
+            rounds = 0
+            while selector is None and rounds < 10:
                 await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                 await asyncio.sleep(1)
-
-            # 再等待一下确保加载完成
-            await asyncio.sleep(2)
-
-            # 尝试不同的选择器获取职位
-            job_elements = []
-            for selector in selectors_to_try:
-                try:
-                    elements = await page.query_selector_all(selector)
-                    if elements and len(elements) > 0:
-                        job_elements = elements
+                rounds += 1
+                for candidate in selectors_to_try:
+                    if await count_matches(page, candidate):
+                        selector = candidate
                         break
-                except Exception:
-                    continue
+            selector = selector or 'a[href*="/careers/"]'
 
-            # 如果上面的选择器都没找到，尝试获取所有 careers 链接
-            if not job_elements:
-                job_elements = await page.query_selector_all('a[href*="/careers/"]')
+            # 剩下的滚动边滚动边分批提取，不保留元素句柄
+            cards = await collect_cards(page, selector, scrolls=10 - rounds, scroll_pause=1)
 
-            for elem in job_elements:
+            for card in cards:
                 try:
-                    href = await elem.get_attribute("href")
+                    href = card["href"]
                     if not href:
                         continue
                     # 过滤非职位链接
                     if any(x in href for x in ["/job-openings", "/team", "/culture", "/benefits", "/life"]):
                         continue
 
-                    text_content = await elem.inner_text()
-                    lines = [l.strip() for l in text_content.split('\n') if l.strip()]
+                    lines = [l.strip() for l in card["text"].split('\n') if l.strip()]
 
                     if len(lines) >= 1 and len(lines[0]) > 3:
                         title = lines[0]
-                        location = lines[1] if len(lines) > 1 else ""
-                        team = lines[2] if len(lines) > 2 else ""
+                        # 地点和部门的顺序不固定，用地名表判断哪一行是地点，都认不出时沿用第二行
+                        extra = lines[1:3]
+                        location = next((l for l in extra if looks_like_location(l)), extra[0] if extra else "")
+                        team = next((l for l in extra if l != location), "")
 
                         # 构建完整URL
                         if href.startswith("/"):
@@ -91,19 +94,9 @@ async def scrape_binance() -> List[Dict]:
 
         except Exception as e:
             print(f"Binance 抓取出错: {e}")
-        finally:
-            await browser.close()
 
     # 去重
-    seen = set()
-    unique_jobs = []
-    for job in jobs:
-        key = (job["title"], job["location"])
-        if key not in seen:
-            seen.add(key)
-            unique_jobs.append(job)
-
-    return unique_jobs
+    return dedupe_jobs(jobs)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,321 @@
+"""
+浏览器页面辅助
+
+爬虫通过 open_page() 拿到页面:
+- 传入已启动的 browser 时只新建 context，用完关闭 context (daemon 模式复用浏览器)
+- 不传时自行启动 playwright 和 Chromium，用完全部关闭 (单次运行)
+
+启用持久化配置 (configure_profiles) 后，每个数据源有自己的配置目录 <root>/<数据源>:
+- 单次运行用 launch_persistent_context，HTTP 磁盘缓存、Cookie、同意弹窗状态都跨运行保留
+- 复用 browser 时无法挂配置目录，改为加载和保存 storage_state.json (Cookie / localStorage)
+- 配置目录超过 MAX_PROFILE_BYTES 时先清缓存，仍超出则整个删除
+- 同一数据源连续 MAX_PROFILE_FAILURES 次运行失败后删除其配置，下次从干净的状态开始
+  (由调度器按每次运行的最终结果记录，重试中的单次失败不计；没有打开过页面的失败，
+  如缺少依赖或只走 API 的失败，与配置无关，也不计)
+
+当前数据源由 Source.scrape 通过 current_profile 设置，爬虫本身不需要改动。
+
+列表页用 collect_cards() 边滚动边分批提取卡片:
+- 每批在页面内用一次 evaluate 取出 {"href", "text"}，不创建 ElementHandle
+- 已提取的节点打上标记；开启 prune 时把已提取的叶子卡片从 DOM 中删掉，虚拟列表不会越滚越大
+- 每批之后检查页面 JS 堆，超过预算或卡片数超过 MAX_CARDS 时提前结束并打印警告
+"""
+import asyncio
+import itertools
+import json
+import os
+import shutil
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, List, Optional
+
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Chromium HTTP 磁盘缓存上限，以及单个配置目录的总上限 (字节)
+DISK_CACHE_BYTES = 100 * 1024 * 1024
+MAX_PROFILE_BYTES = 200 * 1024 * 1024
+
+# 连续多少次运行失败后丢弃配置目录
+MAX_PROFILE_FAILURES = 2
+
+# 可以安全清理的缓存子目录 (相对配置目录)
+CACHE_SUBDIRS = [
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+    "GrShaderCache",
+    "ShaderCache",
+]
+
+# 从别的机器恢复的配置目录里残留的单实例锁，会让 Chromium 拒绝启动
+SINGLETON_FILES = ["SingletonLock", "SingletonCookie", "SingletonSocket"]
+
+# 每批提取的卡片数、单页最多提取的卡片数
+CARD_WINDOW = 50
+MAX_CARDS = 5000
+
+# 单页 JS 堆预算 (字节)，0 表示不限制
+DEFAULT_PAGE_MEMORY_BYTES = 512 * 1024 * 1024
+
+# 在页面内提取一批未处理的卡片，token 区分不同的 collect_cards 调用
+# prune 时只删除不再包含其他匹配元素的卡片，避免连同未提取的子卡片一起删掉
+EXTRACT_CARDS_JS = """([selector, limit, prune, token]) => {
+    const items = [];
+    for (const el of document.querySelectorAll(selector)) {
+        if (el.dataset.scraped === token) continue;
+        if (items.length >= limit) break;
+        const link = el.hasAttribute('href') ? el : el.querySelector('a[href]');
+        items.push({href: link ? link.getAttribute('href') : null, text: el.innerText || ''});
+        if (prune && !el.querySelector(selector)) {
+            el.remove();
+        } else {
+            el.dataset.scraped = token;
+        }
+    }
+    return items;
+}"""
+
+_collect_ids = itertools.count(1)
+
+STORAGE_STATE_FILE = "storage_state.json"
+HEALTH_SUFFIX = ".health.json"
+
+# 配置根目录，为 None 时不使用持久化配置
+_profile_root: Optional[str] = None
+
+# 单页内存预算与是否删除已提取的节点，由 configure_memory 设置
+_page_memory_bytes = DEFAULT_PAGE_MEMORY_BYTES
+_prune_dom = False
+
+# 正在抓取的数据源名称，决定使用哪个配置目录
+current_profile: ContextVar[Optional[str]] = ContextVar("current_profile", default=None)
+
+# 本次运行中用配置目录打开过页面的数据源，由 record_profile_result 取走
+_opened_profiles = set()
+
+
+def configure_profiles(root: Optional[str]):
+    """设置持久化配置根目录，None 表示关闭"""
+    global _profile_root
+    _profile_root = root
+
+
+def configure_memory(page_memory_bytes: int = DEFAULT_PAGE_MEMORY_BYTES, prune_dom: bool = False):
+    """设置单页 JS 堆预算 (0 不限制) 和是否删除已提取的卡片节点"""
+    global _page_memory_bytes, _prune_dom
+    _page_memory_bytes = page_memory_bytes
+    _prune_dom = prune_dom
+
+
+def profile_dir(name: Optional[str] = None) -> Optional[str]:
+    """返回数据源的配置目录，未启用或没有当前数据源时返回 None"""
+    name = name or current_profile.get()
+    if not _profile_root or not name:
+        return None
+    return os.path.join(_profile_root, name.lower())
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+def trim_profile(path: str, max_bytes: int = MAX_PROFILE_BYTES) -> int:
+    """配置目录超过上限时先删缓存，仍超出则整个删除，返回清理后的大小"""
+    size = _dir_size(path)
+    if size <= max_bytes:
+        return size
+    for subdir in CACHE_SUBDIRS:
+        shutil.rmtree(os.path.join(path, subdir), ignore_errors=True)
+    size = _dir_size(path)
+    if size > max_bytes:
+        shutil.rmtree(path, ignore_errors=True)
+        size = 0
+    return size
+
+
+def _health_path(name: str) -> str:
+    # 每个数据源一个文件，多个 worker 进程同时抓不同数据源时互不覆盖
+    return os.path.join(_profile_root, name.lower() + HEALTH_SUFFIX)
+
+
+def _load_failures(name: str) -> int:
+    try:
+        with open(_health_path(name), "r", encoding="utf-8") as f:
+            return int(json.load(f).get("failures", 0))
+    except (OSError, TypeError, ValueError, AttributeError):
+        return 0
+
+
+def record_profile_result(name: str, ok: bool):
+    """记录一次运行 (含全部重试) 的结果，连续失败达到上限时删除该数据源的配置"""
+    path = profile_dir(name)
+    opened = name.lower() in _opened_profiles
+    _opened_profiles.discard(name.lower())
+    if path is None or (not ok and not opened):
+        return
+
+    failures = 0 if ok else _load_failures(name) + 1
+    if failures >= MAX_PROFILE_FAILURES:
+        print(f"  - {name}: {failures} failures in a row, resetting browser profile")
+        shutil.rmtree(path, ignore_errors=True)
+        failures = 0
+
+    os.makedirs(_profile_root, exist_ok=True)
+    health_path = _health_path(name)
+    tmp_path = f"{health_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"failures": failures}, f)
+    os.replace(tmp_path, health_path)
+
+
+async def launch_browser(playwright):
+    """启动无头 Chromium"""
+    return await playwright.chromium.launch(headless=True)
+
+
+@asynccontextmanager
+async def open_page(browser=None, user_agent: str = DEFAULT_USER_AGENT) -> AsyncIterator:
+    """打开一个新页面，退出时释放对应的 context 或浏览器"""
+    path = profile_dir()
+
+    if browser is not None:
+        state_path = os.path.join(path, STORAGE_STATE_FILE) if path else None
+        context = await browser.new_context(
+            user_agent=user_agent,
+            storage_state=state_path if state_path and os.path.exists(state_path) else None,
+        )
+        if path:
+            _opened_profiles.add(current_profile.get().lower())
+        try:
+            yield await context.new_page()
+            if state_path:
+                os.makedirs(path, exist_ok=True)
+                await context.storage_state(path=state_path)
+        finally:
+            await context.close()
+        return
+
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        if path is None:
+            browser = await launch_browser(p)
+            try:
+                context = await browser.new_context(user_agent=user_agent)
+                yield await context.new_page()
+            finally:
+                await browser.close()
+            return
+
+        os.makedirs(path, exist_ok=True)
+        for name in SINGLETON_FILES:
+            try:
+                os.remove(os.path.join(path, name))
+            except OSError:
+                pass
+
+        context = await p.chromium.launch_persistent_context(
+            path,
+            headless=True,
+            user_agent=user_agent,
+            args=[f"--disk-cache-size={DISK_CACHE_BYTES}"],
+        )
+        _opened_profiles.add(current_profile.get().lower())
+        try:
+            # 持久化 context 启动时自带一个空白页，直接复用
+            yield context.pages[0] if context.pages else await context.new_page()
+        finally:
+            await context.close()
+            trim_profile(path)
+
+
+async def page_heap_bytes(page, cdp=None) -> Optional[int]:
+    """页面已用 JS 堆大小，优先用 CDP 的精确值，取不到时用 performance.memory"""
+    if cdp is not None:
+        try:
+            metrics = await cdp.send("Performance.getMetrics")
+            for metric in metrics["metrics"]:
+                if metric["name"] == "JSHeapUsedSize":
+                    return int(metric["value"])
+        except Exception:
+            pass
+    try:
+        return await page.evaluate("() => performance.memory ? performance.memory.usedJSHeapSize : null")
+    except Exception:
+        return None
+
+
+async def collect_cards(
+    page,
+    selector: str,
+    scrolls: int = 0,
+    scroll_pause: float = 1.0,
+    window: int = CARD_WINDOW,
+) -> List[Dict]:
+    """
+    提取匹配 selector 的卡片，返回去重后的 [{"href", "text"}]
+
+    scrolls > 0 时每轮提取后滚动到底部再等待 scroll_pause 秒，滚动加载的内容边加载边提取。
+    """
+    name = current_profile.get() or "page"
+    cdp = None
+    if _page_memory_bytes:
+        try:
+            cdp = await page.context.new_cdp_session(page)
+            await cdp.send("Performance.enable")
+        except Exception:
+            cdp = None
+
+    # 同一页面上多次调用 (如换一组选择器兜底) 时互不影响
+    token = str(next(_collect_ids))
+    cards: List[Dict] = []
+    seen = set()
+    try:
+        for round_ in range(scrolls + 1):
+            while True:
+                batch = await page.evaluate(EXTRACT_CARDS_JS, [selector, window, _prune_dom, token])
+                for item in batch:
+                    key = (item["href"], item["text"])
+                    if key not in seen:
+                        seen.add(key)
+                        cards.append(item)
+                if len(batch) < window or len(cards) >= MAX_CARDS:
+                    break
+
+            if len(cards) >= MAX_CARDS:
+                print(f"  - {name}: reached {MAX_CARDS} cards, stopping early")
+                break
+            heap = await page_heap_bytes(page, cdp) if _page_memory_bytes else None
+            if heap and heap > _page_memory_bytes:
+                print(f"  - {name}: page JS heap {heap / 1024 / 1024:.0f}MB over budget "
+                      f"{_page_memory_bytes / 1024 / 1024:.0f}MB, stopping early with {len(cards)} cards")
+                break
+            if round_ == scrolls:
+                break
+
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await asyncio.sleep(scroll_pause)
+    finally:
+        if cdp is not None:
+            try:
+                await cdp.detach()
+            except Exception:
+                pass
+
+    return cards
+
+
+async def count_matches(page, selector: str) -> int:
+    """不创建 ElementHandle 地统计匹配数量"""
+    try:
+        return await page.evaluate("(selector) => document.querySelectorAll(selector).length", selector)
+    except Exception:
+        return 0
@@ -0,0 +1,339 @@
+"""
+常驻模式 (daemon)
+
+与每天跑一次 main.py 不同，daemon 只启动一次 Playwright / Chromium 和 aiohttp 会话，
+按各数据源的间隔循环抓取，并在本地 HTTP 端口提供内存中的最新结果:
+
+    GET /jobs              最新筛选结果
+    GET /deltas?since=N    版本 N 之后的增量 (新增 / 删除 / 变化)
+    GET /metrics           各数据源的运行指标
+
+所有响应带 ETag，客户端带 If-None-Match 轮询时内容未变返回 304。
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .browser import launch_browser
+from .enrich import enrich_jobs
+from .jobset import diff_jobs, job_id
+from .scheduler import SiteResult, run_site
+
+
+# 未单独配置时各数据源的抓取间隔 (秒)
+DEFAULT_INTERVAL = 60 * 60
+
+# 自适应调度时两次检查之间的最短等待 (秒)
+MIN_LOOP_INTERVAL = 60
+
+# 内存中保留的增量个数，更早的版本只能重新拉取 /jobs
+MAX_DELTAS = 100
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+def encode_json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def make_etag(body: bytes) -> str:
+    return '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """判断 If-None-Match 是否命中 (支持多个值、弱校验和 *)"""
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+class ResultCache:
+    """最新筛选结果与增量，/jobs 的响应体和 ETag 在更新时预先计算"""
+
+    def __init__(self, max_deltas: int = MAX_DELTAS):
+        self.version = 0
+        self.jobs: List[Dict] = []
+        self.stale_companies: List[str] = []
+        self.update_time: Optional[str] = None
+        self.deltas = deque(maxlen=max_deltas)
+        self.jobs_body = encode_json({"version": 0, "total_count": 0, "jobs": []})
+        self.jobs_etag = make_etag(self.jobs_body)
+
+    def update(self, jobs: List[Dict], stale_companies: List[str]) -> bool:
+        """写入新结果，内容没有变化时不升版本并返回 False"""
+        # /jobs 里的职位带上 id，与 /deltas 中 removed 的 ID 对应
+        for job in jobs:
+            job["id"] = job_id(job)
+        delta = diff_jobs(self.jobs, jobs)
+        if self.version and not any(delta.values()) and stale_companies == self.stale_companies:
+            return False
+
+        self.version += 1
+        self.jobs = jobs
+        self.stale_companies = stale_companies
+        self.update_time = datetime.now().isoformat()
+        self.deltas.append({
+            "from": self.version - 1,
+            "to": self.version,
+            "update_time": self.update_time,
+            **delta,
+        })
+        self.jobs_body = encode_json({
+            "version": self.version,
+            "update_time": self.update_time,
+            "total_count": len(jobs),
+            "stale_companies": stale_companies,
+            "jobs": jobs,
+        })
+        self.jobs_etag = make_etag(self.jobs_body)
+        return True
+
+    def deltas_since(self, version: int) -> Optional[List[Dict]]:
+        """返回 version 之后的增量，version 已被淘汰时返回 None"""
+        if version >= self.version:
+            return []
+        if not self.deltas or version < self.deltas[0]["from"]:
+            return None
+        return [delta for delta in self.deltas if delta["from"] >= version]
+
+
+class Daemon:
+    """常驻抓取进程，复用浏览器和 HTTP 会话"""
+
+    def __init__(
+        self,
+        sources,
+        filter_jobs: Callable[[List[Dict]], List[Dict]],
+        intervals: Optional[Dict[str, float]] = None,
+        default_interval: float = DEFAULT_INTERVAL,
+        previous: Optional[Dict[str, List[Dict]]] = None,
+        publish: Optional[Callable[[List[SiteResult], List[Dict], List[str]], None]] = None,
+        enrich_cache=None,
+        planner=None,
+    ):
+        self.sources = list(sources)
+        self.filter_jobs = filter_jobs
+        self.intervals = {k.lower(): v for k, v in (intervals or {}).items()}
+        self.default_interval = default_interval
+        self.publish = publish
+        self.enrich_cache = enrich_cache
+        # 自适应调度 (CrawlPlanner)，设置后忽略固定间隔
+        self.planner = planner
+        self.cache = ResultCache()
+        self.raw: Dict[str, List[Dict]] = dict(previous or {})
+        self.results: Dict[str, SiteResult] = {}
+        self.metrics: Dict[str, Dict] = {source.name: {
+            "runs": 0, "ok": 0, "stale": 0, "failed": 0,
+            "last_status": None, "last_error": "", "last_count": 0,
+            "last_duration": None, "last_run_at": None, "next_run_at": None,
+        } for source in self.sources}
+        self.started_at = datetime.now().isoformat()
+        self.browser = None
+        self.session = None
+        self._playwright = None
+        self._browser_lock = asyncio.Lock()
+        # 同一时间只有一次重新筛选，版本按顺序递增
+        self._rebuild_lock = asyncio.Lock()
+
+    def interval_for(self, name: str) -> float:
+        return self.intervals.get(name.lower(), self.default_interval)
+
+    async def get_browser(self):
+        """返回常驻浏览器，崩溃或断开后重新启动"""
+        async with self._browser_lock:
+            if self.browser is None or not self.browser.is_connected():
+                if self.browser is not None:
+                    print("[daemon] Browser disconnected, relaunching")
+                self.browser = await launch_browser(self._playwright)
+            return self.browser
+
+    async def rebuild(self):
+        """
+        根据各数据源的原始结果重新筛选并更新缓存
+
+        筛选和发布 (写快照、jobs.json、feed、HTML) 在线程中执行，期间 HTTP 接口和其他数据源的抓取照常进行；
+        缓存只在事件循环里更新，请求处理不会读到写了一半的结果。
+        """
+        async with self._rebuild_lock:
+            raw = dict(self.raw)
+            all_jobs = [dict(job) for jobs in raw.values() for job in jobs]
+            filtered = await asyncio.to_thread(self.filter_jobs, all_jobs)
+            stale_companies = [
+                name for name, jobs in raw.items()
+                if any(job.get("stale") for job in jobs)
+            ]
+            if self.cache.update(filtered, stale_companies):
+                print(f"[daemon] Version {self.cache.version}: {len(filtered)} matching jobs")
+                if self.publish:
+                    # 还没抓过的数据源以 skipped 状态带上沿用的结果，保证快照完整
+                    results = [
+                        self.results.get(name) or SiteResult(name=name, jobs=jobs, status="skipped")
+                        for name, jobs in raw.items()
+                    ]
+                    await asyncio.to_thread(self.publish, results, filtered, stale_companies)
+
+    async def run_source(self, source) -> SiteResult:
+        """抓取一次单个数据源并记录指标"""
+        async def scrape():
+            # 每次尝试都重新取浏览器，上一次尝试中 Chromium 崩溃时重试会用新启动的浏览器
+            return await source.scrape(browser=await self.get_browser(), session=self.session)
+
+        result = await run_site(
+            source.name,
+            scrape,
+            deadline=time.monotonic() + source.budget,
+            budget=source.budget,
+            previous=self.raw.get(source.name),
+        )
+
+        if result.status == "ok" and self.enrich_cache is not None:
+            try:
+                await enrich_jobs(result.jobs, cache=self.enrich_cache, session=self.session,
+                                  browser=await self.get_browser())
+            except Exception as e:
+                print(f"[daemon] {source.name}: enrichment failed - {e}")
+            self.enrich_cache.save()
+
+        stats = self.metrics[source.name]
+        stats["runs"] += 1
+        stats[result.status] += 1
+        stats["last_status"] = result.status
+        stats["last_error"] = result.error
+        stats["last_count"] = len(result.jobs)
+        stats["last_duration"] = round(result.elapsed, 2)
+        stats["last_run_at"] = datetime.now().isoformat()
+
+        self.results[source.name] = result
+        if result.jobs:
+            self.raw[source.name] = result.jobs
+        print(f"[daemon] {source.name}: {result.status}, {len(result.jobs)} jobs in {result.elapsed:.0f}s")
+        return result
+
+    async def source_loop(self, source):
+        """按间隔循环抓取单个数据源"""
+        while True:
+            try:
+                scrape, reason = True, ""
+                if self.planner is not None:
+                    scrape, reason = await self.planner.should_scrape(source, self.session)
+                if scrape:
+                    result = await self.run_source(source)
+                    if self.planner is not None:
+                        self.planner.record(source.name, result.status, result.jobs)
+                    await self.rebuild()
+                else:
+                    print(f"[daemon] {source.name}: skipped ({reason})")
+            except Exception as e:
+                print(f"[daemon] {source.name}: unexpected error - {e}")
+
+            if self.planner is not None:
+                self.planner.save()
+                interval = max(MIN_LOOP_INTERVAL, self.planner.seconds_until_due(source.name))
+            else:
+                interval = self.interval_for(source.name)
+            self.metrics[source.name]["next_run_at"] = datetime.fromtimestamp(time.time() + interval).isoformat()
+            await asyncio.sleep(interval)
+
+    def metrics_payload(self) -> Dict:
+        return {
+            "started_at": self.started_at,
+            "version": self.cache.version,
+            "update_time": self.cache.update_time,
+            "total_count": len(self.cache.jobs),
+            "browser_connected": bool(self.browser and self.browser.is_connected()),
+            "sources": self.metrics,
+        }
+
+    def make_app(self):
+        """创建 aiohttp 应用"""
+        from aiohttp import web
+
+        def respond(request, body: bytes, status: int = 200, etag: Optional[str] = None):
+            etag = etag or make_etag(body)
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            if status == 200 and etag_matches(request.headers.get("If-None-Match", ""), etag):
+                return web.Response(status=304, headers=headers)
+            return web.Response(status=status, body=body, content_type="application/json", headers=headers)
+
+        async def handle_jobs(request):
+            return respond(request, self.cache.jobs_body, etag=self.cache.jobs_etag)
+
+        async def handle_deltas(request):
+            try:
+                since = int(request.query.get("since", "0"))
+            except ValueError:
+                return respond(request, encode_json({"error": "since must be an integer"}), status=400)
+
+            deltas = self.cache.deltas_since(since)
+            if deltas is None:
+                # 版本太旧，客户端需要重新拉取完整结果
+                return respond(request, encode_json({
+                    "error": f"version {since} is no longer available, fetch /jobs",
+                    "version": self.cache.version,
+                }), status=410)
+            return respond(request, encode_json({"version": self.cache.version, "deltas": deltas}))
+
+        async def handle_metrics(request):
+            return respond(request, encode_json(self.metrics_payload()))
+
+        app = web.Application()
+        app.router.add_get("/jobs", handle_jobs)
+        app.router.add_get("/deltas", handle_deltas)
+        app.router.add_get("/metrics", handle_metrics)
+        return app
+
+    async def run(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """启动浏览器、HTTP 会话和本地服务，然后持续抓取"""
+        import aiohttp
+        from aiohttp import web
+        from playwright.async_api import async_playwright
+
+        # 先用上次的结果填充缓存，服务启动后马上就有数据
+        if self.raw:
+            await self.rebuild()
+
+        async with async_playwright() as p:
+            self._playwright = p
+            async with aiohttp.ClientSession() as session:
+                self.session = session
+                runner = web.AppRunner(self.make_app())
+                await runner.setup()
+                await web.TCPSite(runner, host, port).start()
+                print(f"[daemon] Serving on http://{host}:{port} (/jobs, /deltas, /metrics)")
+
+                try:
+                    await asyncio.gather(*(self.source_loop(source) for source in self.sources))
+                finally:
+                    await runner.cleanup()
+                    if self.browser is not None:
+                        await self.browser.close()
+
+
+if __name__ == "__main__":
+    # 回归检查: python -m scraper.daemon
+    from .filters import filter_jobs
+
+    raw = {"Example": [{"title": "Graduate Engineer", "location": "Hong Kong", "url": "https://example.com/1",
+                        "company": "Example"}]}
+    daemon = Daemon([], filter_jobs=filter_jobs, previous=raw, publish=lambda *_: None)
+    asyncio.run(daemon.rebuild())
+    first = (daemon.cache.version, daemon.cache.jobs_etag)
+    asyncio.run(daemon.rebuild())
+    second = (daemon.cache.version, daemon.cache.jobs_etag)
+    body = json.loads(daemon.cache.jobs_body)
+    failed = []
+    if first != second:
+        failed.append(f"rebuild on the same input changed version/ETag: {first} -> {second}")
+    if [job.get("id") for job in body["jobs"]] != [job_id(job) for job in raw["Example"]]:
+        failed.append("/jobs body is missing job ids")
+    for message in failed:
+        print(f"FAIL {message}")
+    print(f"{2 - len(failed)}/2 passed")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,317 @@
+"""
+职位详情补全
+
+列表页经常拿不到地点 (Binance 为空，OKX / Bitget 回退为 "Not specified")，
+Bitget 的 team 字段里 "Posted on 2025-09-17" 这类日期在抓取时已由 jobset.normalize_jobs 移走。
+这里只对缺地点的职位去抓详情，补出地点、部门和发布日期:
+
+1. Greenhouse 链接 (OKX) 走公开的 boards-api JSON
+2. 其他链接先用 aiohttp 取 HTML，解析 JSON-LD JobPosting
+3. 单页应用 (如 Mokahr 的 #/job/ 路由) 或 HTML 里没有结构化数据时才用浏览器渲染
+
+请求在有限并发的池中执行，共用一个 aiohttp 会话；结果按 job_id 缓存在磁盘上，跨运行复用。
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional
+
+from .browser import DEFAULT_USER_AGENT, launch_browser, open_page
+from .gazetteer import looks_like_location
+from .jobset import POSTED_RE, job_id, normalize_date
+
+
+# 视为缺失的地点占位符
+MISSING_LOCATIONS = {"", "not specified", "n/a", "-"}
+
+# HTTP 并发数与浏览器并发数
+CONCURRENCY = 8
+BROWSER_CONCURRENCY = 2
+
+# 单次运行最多补全的职位数与总时间预算 (秒)
+MAX_ENRICH = 300
+ENRICH_BUDGET = 90
+
+# 缓存有效期: 成功结果 30 天，失败结果 1 天后重试
+CACHE_TTL = 30 * 24 * 3600
+FAILURE_TTL = 24 * 3600
+
+LOCATION_LABEL_RE = re.compile(r"^(?:location|work location|job location|office|工作地点|工作城市|地点|城市)\s*[:：]?\s*(.*)$", re.I)
+DEPARTMENT_LABEL_RE = re.compile(r"^(?:department|team|职能|部门|所属部门)\s*[:：]?\s*(.*)$", re.I)
+JSON_LD_RE = re.compile(r'<script[^>]+type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+GREENHOUSE_RE = re.compile(r"greenhouse\.io/(?:embed/job_app\?for=)?([\w-]+)/jobs/(\d+)")
+
+
+def is_missing_location(location: Optional[str]) -> bool:
+    """空值、占位符，或者地名表认不出来的文字 (多半是误解析的描述) 都算缺失"""
+    location = (location or "").strip()
+    return location.lower() in MISSING_LOCATIONS or not looks_like_location(location)
+
+
+def needs_enrichment(job: Dict) -> bool:
+    """只有缺地点的职位才去抓详情 (顺带补部门和发布日期)"""
+    return is_missing_location(job.get("location")) and bool(job.get("url"))
+
+
+class EnrichmentCache:
+    """按 job_id 保存详情解析结果的 JSON 文件缓存"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self.entries.get(key)
+        if not entry:
+            return None
+        ttl = CACHE_TTL if entry.get("fields") else FAILURE_TTL
+        if time.time() - entry.get("fetched_at", 0) > ttl:
+            return None
+        return entry
+
+    def put(self, key: str, fields: Dict):
+        self.entries[key] = {"fields": fields, "fetched_at": time.time()}
+        self.dirty = True
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        # 顺手清理过期条目，防止文件无限增长
+        now = time.time()
+        self.entries = {
+            key: entry for key, entry in self.entries.items()
+            if now - entry.get("fetched_at", 0) <= CACHE_TTL
+        }
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+
+def parse_json_ld(html: str) -> Dict:
+    """从 HTML 的 JSON-LD JobPosting 中取地点和发布日期"""
+    for block in JSON_LD_RE.findall(html):
+        try:
+            data = json.loads(block.strip())
+        except ValueError:
+            continue
+
+        items = data if isinstance(data, list) else data.get("@graph", [data])
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            # @type 可以是字符串，也可以是 ["JobPosting"] 这样的列表
+            types = item.get("@type")
+            if "JobPosting" not in (types if isinstance(types, list) else [types]):
+                continue
+
+            fields = {}
+            locations = item.get("jobLocation") or []
+            if isinstance(locations, dict):
+                locations = [locations]
+            names = []
+            for loc in locations:
+                address = loc.get("address", {}) if isinstance(loc, dict) else {}
+                if isinstance(address, str):
+                    names.append(address)
+                    continue
+                country = address.get("addressCountry", "")
+                if isinstance(country, dict):
+                    country = country.get("name", "")
+                parts = [address.get("addressLocality", ""), address.get("addressRegion", ""), country]
+                name = ", ".join(dict.fromkeys(p for p in parts if p))
+                if name:
+                    names.append(name)
+            if names:
+                fields["location"] = " / ".join(names)
+            if item.get("jobLocationType") == "TELECOMMUTE" and "location" not in fields:
+                fields["location"] = "Remote"
+            if item.get("datePosted"):
+                fields["posted_date"] = normalize_date(item["datePosted"])
+            if item.get("occupationalCategory"):
+                fields["department"] = str(item["occupationalCategory"])
+            return fields
+    return {}
+
+
+def parse_detail_text(text: str) -> Dict:
+    """从渲染后的详情页文本中按标签找地点、部门和发布日期"""
+    fields = {}
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+
+    for i, line in enumerate(lines[:80]):
+        for key, pattern in (("location", LOCATION_LABEL_RE), ("department", DEPARTMENT_LABEL_RE)):
+            if key in fields:
+                continue
+            match = pattern.match(line)
+            if match:
+                # 标签和值可能在同一行，也可能在下一行
+                value = match.group(1).strip() or (lines[i + 1] if i + 1 < len(lines) else "")
+                if 1 < len(value) <= 80:
+                    fields[key] = value
+
+    match = POSTED_RE.search(text)
+    if match:
+        fields["posted_date"] = normalize_date(match.group(1))
+    return fields
+
+
+def needs_browser(url: str) -> bool:
+    """hash 路由的单页应用只能靠浏览器渲染"""
+    return "#/" in url
+
+
+async def fetch_greenhouse(session, board: str, gh_id: str) -> Dict:
+    api = f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs/{gh_id}"
+    async with session.get(api, timeout=20) as resp:
+        if resp.status != 200:
+            return {}
+        data = await resp.json()
+
+    fields = {}
+    location = (data.get("location") or {}).get("name")
+    if location:
+        fields["location"] = location
+    departments = [d.get("name") for d in data.get("departments") or [] if d.get("name")]
+    if departments:
+        fields["department"] = departments[0]
+    posted = data.get("first_published") or data.get("updated_at")
+    if posted:
+        fields["posted_date"] = posted[:10]
+    return fields
+
+
+async def fetch_html(session, url: str) -> Dict:
+    headers = {"User-Agent": DEFAULT_USER_AGENT, "Accept": "text/html"}
+    async with session.get(url, headers=headers, timeout=20) as resp:
+        if resp.status != 200:
+            return {}
+        html = await resp.text()
+    return parse_json_ld(html)
+
+
+async def fetch_rendered(browser, url: str) -> Dict:
+    async with open_page(browser) as page:
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        try:
+            await page.wait_for_load_state("networkidle", timeout=10000)
+        except Exception:
+            pass
+        text = await page.inner_text("body")
+    return parse_detail_text(text)
+
+
+def apply_fields(job: Dict, fields: Dict) -> bool:
+    """只填补缺失的字段，返回是否有改动"""
+    changed = False
+    if fields.get("location") and is_missing_location(job.get("location")):
+        job["location"] = fields["location"]
+        changed = True
+    if fields.get("department") and not job.get("team"):
+        job["team"] = fields["department"]
+        changed = True
+    if fields.get("posted_date") and not job.get("posted_date"):
+        job["posted_date"] = fields["posted_date"]
+        changed = True
+    return changed
+
+
+async def enrich_jobs(
+    jobs: List[Dict],
+    cache: Optional[EnrichmentCache] = None,
+    session=None,
+    browser=None,
+    limit: int = MAX_ENRICH,
+    budget: float = ENRICH_BUDGET,
+    use_browser: bool = True,
+) -> Dict[str, int]:
+    """
+    原地补全职位字段，返回统计 {"candidates", "cached", "fetched", "filled", "failed"}
+
+    session / browser 可以传入复用 (daemon 模式)，否则按需创建；浏览器只在确实有
+    需要渲染的职位时才启动。
+    """
+    cache = cache or EnrichmentCache()
+    stats = {"candidates": 0, "cached": 0, "fetched": 0, "filled": 0, "failed": 0}
+
+    to_fetch = []
+    for job in jobs:
+        if not needs_enrichment(job):
+            continue
+        stats["candidates"] += 1
+        entry = cache.get(job_id(job))
+        if entry is not None:
+            stats["cached"] += 1
+            stats["filled"] += apply_fields(job, entry["fields"])
+        elif len(to_fetch) < limit:
+            to_fetch.append(job)
+
+    if not to_fetch:
+        return stats
+
+    http_sem = asyncio.Semaphore(CONCURRENCY)
+    browser_sem = asyncio.Semaphore(BROWSER_CONCURRENCY)
+    browser_lock = asyncio.Lock()
+
+    async with AsyncExitStack() as stack:
+        if session is None:
+            import aiohttp
+            connector = aiohttp.TCPConnector(limit=CONCURRENCY, limit_per_host=4)
+            session = await stack.enter_async_context(aiohttp.ClientSession(connector=connector))
+
+        async def get_browser():
+            nonlocal browser
+            async with browser_lock:
+                if browser is None:
+                    from playwright.async_api import async_playwright
+                    playwright = await stack.enter_async_context(async_playwright())
+                    browser = await launch_browser(playwright)
+                    stack.push_async_callback(browser.close)
+                return browser
+
+        async def enrich_one(job: Dict):
+            url = job["url"]
+            fields = {}
+            try:
+                greenhouse = GREENHOUSE_RE.search(url)
+                if greenhouse:
+                    async with http_sem:
+                        fields = await fetch_greenhouse(session, *greenhouse.groups())
+                elif not needs_browser(url):
+                    async with http_sem:
+                        fields = await fetch_html(session, url)
+
+                if not fields and use_browser and not greenhouse:
+                    async with browser_sem:
+                        fields = await fetch_rendered(await get_browser(), url)
+            except Exception:
+                fields = {}
+
+            cache.put(job_id(job), fields)
+            stats["fetched"] += 1
+            if fields:
+                stats["filled"] += apply_fields(job, fields)
+            else:
+                stats["failed"] += 1
+
+        tasks = [asyncio.ensure_future(enrich_one(job)) for job in to_fetch]
+        _, pending = await asyncio.wait(tasks, timeout=budget)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return stats
+
@@ -0,0 +1,165 @@
+"""
+增量更新 feed
+
+每次输出时和上一版的筛选结果比较，只在有变化时递增版本号，写出 output/feed/:
+
+- version.json              当前版本、最新全量快照版本、可用增量的范围
+- delta-<from>-<to>.json    相邻两个版本之间的增量 {"added", "removed", "changed"}
+- since-<N>.json            从版本 N 到当前版本的合并增量 (N 从最新快照版本起)
+- snapshot-<V>.json         每 SNAPSHOT_INTERVAL 个版本压缩出的全量快照
+
+客户端记住自己的版本号: 落后不多时取 since-<N>.json 一个文件即可追上，
+落后超过最新快照时先取快照再取 since-<快照版本>.json。
+早于最旧快照的增量会被删除，feed 目录大小有上限。
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .jobset import diff_jobs, job_id
+
+
+FEED_FORMAT = 1
+
+# 每隔多少个版本生成一次全量快照
+SNAPSHOT_INTERVAL = 24
+
+# 保留的全量快照数量，更早的快照和增量会被清理
+KEEP_SNAPSHOTS = 2
+
+VERSION_FILE = "version.json"
+STATE_FILE = "state.json"
+
+
+def _path(feed_dir: str, name: str) -> str:
+    return os.path.join(feed_dir, name)
+
+
+def _read_json(path: str) -> Optional[Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: str, data: Dict):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _list_versions(feed_dir: str, prefix: str) -> List[int]:
+    """列出 snapshot-<V>.json 的版本号，或 delta-<from>-<to>.json 的 from"""
+    versions = []
+    for name in os.listdir(feed_dir):
+        if name.startswith(prefix) and name.endswith(".json"):
+            try:
+                versions.append(int(name[len(prefix):-len(".json")].split("-")[0]))
+            except ValueError:
+                continue
+    return sorted(versions)
+
+
+def assign_ids(jobs: List[Dict]) -> List[Dict]:
+    """给每个职位加上稳定的 id 字段，客户端按 id 合并增量"""
+    for job in jobs:
+        job["id"] = job_id(job)
+    return jobs
+
+
+def merge_deltas(deltas: List[Dict]) -> Dict[str, List]:
+    """把连续的增量合并成一个，结果等价于依次应用"""
+    added: Dict[str, Dict] = {}
+    changed: Dict[str, Dict] = {}
+    removed: Dict[str, None] = {}
+
+    for delta in deltas:
+        for job in delta["added"]:
+            if job["id"] in removed:
+                # 先删后加，对客户端来说是一次修改
+                del removed[job["id"]]
+                changed[job["id"]] = job
+            else:
+                added[job["id"]] = job
+        for job in delta["changed"]:
+            if job["id"] in added:
+                added[job["id"]] = job
+            else:
+                changed[job["id"]] = job
+        for key in delta["removed"]:
+            if key in added:
+                del added[key]
+            else:
+                changed.pop(key, None)
+                removed[key] = None
+
+    return {"added": list(added.values()), "removed": list(removed), "changed": list(changed.values())}
+
+
+def update_feed(jobs: List[Dict], feed_dir: str) -> int:
+    """
+    用本次的筛选结果 (已带 id) 更新 feed，返回当前版本号
+
+    结果与上一版完全相同时不产生新版本。
+    """
+    os.makedirs(feed_dir, exist_ok=True)
+    state = _read_json(_path(feed_dir, STATE_FILE))
+    if not state or state.get("format") != FEED_FORMAT:
+        # 没有状态时从头开始，清掉无法衔接的旧文件
+        state = {"format": FEED_FORMAT, "version": 0, "jobs": []}
+        for prefix in ("snapshot-", "delta-", "since-"):
+            for name in os.listdir(feed_dir):
+                if name.startswith(prefix):
+                    os.remove(_path(feed_dir, name))
+
+    version = state["version"]
+    delta = diff_jobs(state["jobs"], jobs)
+    if version and not any(delta.values()):
+        return version
+
+    now = datetime.now().isoformat()
+    new_version = version + 1
+    if version:
+        _write_json(_path(feed_dir, f"delta-{version}-{new_version}.json"),
+                    {"from": version, "to": new_version, "created_at": now, **delta})
+
+    snapshots = _list_versions(feed_dir, "snapshot-")
+    if not snapshots or new_version - snapshots[-1] >= SNAPSHOT_INTERVAL:
+        _write_json(_path(feed_dir, f"snapshot-{new_version}.json"),
+                    {"version": new_version, "created_at": now, "jobs": jobs})
+        snapshots.append(new_version)
+
+    # 压缩: 只保留最近几个快照，以及最旧快照之后的增量
+    for old in snapshots[:-KEEP_SNAPSHOTS]:
+        os.remove(_path(feed_dir, f"snapshot-{old}.json"))
+    snapshots = snapshots[-KEEP_SNAPSHOTS:]
+    for start in _list_versions(feed_dir, "delta-"):
+        if start < snapshots[0]:
+            os.remove(_path(feed_dir, f"delta-{start}-{start + 1}.json"))
+    for start in _list_versions(feed_dir, "since-"):
+        os.remove(_path(feed_dir, f"since-{start}.json"))
+
+    # since-<N>: 从最新快照版本开始，逐个向前合并
+    latest_snapshot = snapshots[-1]
+    deltas = []
+    for start in range(new_version - 1, latest_snapshot - 1, -1):
+        deltas.insert(0, _read_json(_path(feed_dir, f"delta-{start}-{start + 1}.json")))
+        _write_json(_path(feed_dir, f"since-{start}.json"),
+                    {"from": start, "to": new_version, "created_at": now, **merge_deltas(deltas)})
+
+    deltas_from = _list_versions(feed_dir, "delta-")
+    _write_json(_path(feed_dir, VERSION_FILE), {
+        "format": FEED_FORMAT,
+        "version": new_version,
+        "updated_at": now,
+        "total_count": len(jobs),
+        "snapshot": latest_snapshot,
+        "snapshots": snapshots,
+        "since_from": latest_snapshot,
+        "deltas_from": deltas_from[0] if deltas_from else new_version,
+    })
+    _write_json(_path(feed_dir, STATE_FILE), {"format": FEED_FORMAT, "version": new_version, "jobs": jobs})
+    return new_version
@@ -0,0 +1,134 @@
+"""
+职位筛选
+
+筛选条件:
+1. 地点在香港
+2. 面向应届生且地点不在中国大陆
+"""
+from typing import Dict, List, Optional, Tuple
+
+from .gazetteer import Location, canonicalize_location
+
+
+# 应届生/校招关键词
+GRADUATE_KEYWORDS = [
+    "graduate", "new grad", "new graduate", "fresh graduate",
+    "entry level", "entry-level", "junior", "campus",
+    "university", "intern to full", "graduate program",
+    "应届", "校招", "毕业生", "实习转正", "管培"
+]
+
+HONG_KONG_REASON = "Location: Hong Kong"
+GRADUATE_REASON = "Graduate position (non-mainland)"
+
+
+def is_in_hong_kong(location: str) -> bool:
+    """检查是否在香港"""
+    return "HK" in canonicalize_location(location).countries
+
+
+def is_in_mainland_china(location: str) -> bool:
+    """检查是否在中国大陆"""
+    return "CN" in canonicalize_location(location).countries
+
+
+def is_graduate_position(title: str, team: str = "") -> bool:
+    """检查是否是应届生/校招职位"""
+    text = f"{title} {team}".lower()
+    return any(kw in text for kw in GRADUATE_KEYWORDS)
+
+
+def classify(location: str, title: str, team: str) -> Tuple[Optional[str], Location]:
+    """返回 (匹配原因或 None, 规范化地点)"""
+    # 地点只规范化一次 (按原文缓存)，之后都是结构化字段比较
+    loc = canonicalize_location(location)
+
+    # 条件1: 香港职位
+    if "HK" in loc.countries:
+        return HONG_KONG_REASON, loc
+
+    # 条件2: 应届生职位且不在大陆
+    if "CN" not in loc.countries and is_graduate_position(title, team):
+        return GRADUATE_REASON, loc
+
+    return None, loc
+
+
+def filter_jobs(jobs: List[Dict]) -> List[Dict]:
+    """
+    筛选职位:
+    条件1: 地点在香港
+    条件2: 面向应届生且地点不在中国大陆
+
+    满足任一条件即可
+    """
+    filtered = []
+
+    for job in jobs:
+        reason, location = classify(job.get("location", ""), job.get("title", ""), job.get("team", ""))
+        job["country"] = location.country
+        job["city"] = location.city
+        job["remote"] = location.remote
+
+        if reason:
+            job["match_reason"] = reason
+            filtered.append(job)
+
+    return filtered
+
+
+if __name__ == "__main__":
+    # 回归检查: python -m scraper.filters
+    # (地点, 应届生职位的预期匹配原因, 非应届生职位的预期匹配原因)
+    cases = [
+        ("Suzhou Industrial Park, Jiangsu Province, China", None, None),
+        ("Hong Kong Island East, Quarry Bay, Taikoo Place", HONG_KONG_REASON, HONG_KONG_REASON),
+        ("Hong Kong Science and Technology Park, Sha Tin, New Territories", HONG_KONG_REASON, HONG_KONG_REASON),
+        ("Shanghai", None, None),
+        ("Singapore", GRADUATE_REASON, None),
+        ("Dublin, Ireland", GRADUATE_REASON, None),
+    ]
+    failed = 0
+    for location, graduate, other in cases:
+        for title, expected in (("Graduate Software Engineer", graduate), ("Senior Software Engineer", other)):
+            reason, _ = classify(location, title, "")
+            if reason != expected:
+                failed += 1
+                print(f"FAIL {location!r} / {title!r}: {reason!r} != {expected!r}")
+    total = len(cases) * 2
+
+    # 列式筛选必须与 filter_jobs 完全一致，含 "İ" 的文本走逐条重算的分支
+    import copy
+
+    from . import columnar
+    from .benchmarks.synthetic import generate_jobs
+
+    if columnar.np is None:
+        print("SKIP filter_jobs_columnar equivalence (NumPy not installed)")
+    else:
+        jobs = generate_jobs(20_000)
+        jobs += [
+            {"title": "UNİVERSİTY Recruit", "team": "", "location": "İstanbul", "company": "Example", "url": "u1"},
+            # 最长的文本决定定长数组的宽度，小写后变长的部分会被截掉
+            {"title": "İİİ " + "Analyst " * 40 + "graduate", "team": "", "location": "London", "company": "Example",
+             "url": "u2"},
+            {"title": "Senior Engineer", "team": "GRADUATE PROGRAM İ", "location": "Shanghai", "company": "Example",
+             "url": "u3"},
+        ]
+        expected = filter_jobs(copy.deepcopy(jobs))
+
+        # NumPy 1.x 只有定长字符串，"İ" 小写后变长会被截断；两种字符串类型都要检查
+        variable_width = columnar._string_array
+        fixed_width = lambda values: columnar.np.array(values, dtype=str)  # noqa: E731
+        for label, string_array in (("default", variable_width), ("fixed-width", fixed_width)):
+            columnar._string_array = string_array
+            actual = columnar.filter_jobs_columnar(copy.deepcopy(jobs))
+            total += 1
+            if actual != expected:
+                failed += 1
+                print(f"FAIL filter_jobs_columnar ({label} strings) differs from filter_jobs "
+                      f"({len(actual)} vs {len(expected)} jobs)")
+        columnar._string_array = variable_width
+
+    print(f"{total - failed}/{total} passed")
+    raise SystemExit(1 if failed else 0)
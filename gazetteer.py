@@ -0,0 +1,304 @@
+"""
+地点规范化 (gazetteer)
+
+各网站的地点写法五花八门: "Hong Kong, Hong Kong SAR"、"HK"、"香港"、"Not specified"，
+还有被误当成地点的部门或描述文字。这里用别名表 + 字典树把地点文本一次性解析成
+国家 / 城市 / 是否远程，结果按原文缓存 (LRU)，同样的字符串只解析一次。
+"""
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+# (国家代码, 城市) -> 别名，城市为空表示只知道国家
+PLACES: Dict[Tuple[str, str], List[str]] = {
+    ("HK", "Hong Kong"): ["hong kong", "hongkong", "hong kong sar", "hksar", "hk", "香港", "香港特别行政区",
+                          "kowloon", "九龙", "九龍"],
+    ("MO", "Macau"): ["macau", "macao", "澳门"],
+    ("TW", "Taipei"): ["taipei", "台北", "臺北"],
+    ("TW", ""): ["taiwan", "台湾", "台灣", "臺灣"],
+    ("SG", "Singapore"): ["singapore", "新加坡"],
+
+    # 中国大陆
+    ("CN", "Beijing"): ["beijing", "北京"],
+    ("CN", "Shanghai"): ["shanghai", "上海"],
+    ("CN", "Shenzhen"): ["shenzhen", "深圳"],
+    ("CN", "Guangzhou"): ["guangzhou", "广州"],
+    ("CN", "Hangzhou"): ["hangzhou", "杭州"],
+    ("CN", "Chengdu"): ["chengdu", "成都"],
+    ("CN", "Nanjing"): ["nanjing", "南京"],
+    ("CN", "Wuhan"): ["wuhan", "武汉"],
+    ("CN", "Xi'an"): ["xian", "xi'an", "西安"],
+    ("CN", "Suzhou"): ["suzhou", "苏州"],
+    ("CN", "Tianjin"): ["tianjin", "天津"],
+    ("CN", "Chongqing"): ["chongqing", "重庆"],
+    ("CN", "Dongguan"): ["dongguan", "东莞"],
+    ("CN", "Foshan"): ["foshan", "佛山"],
+    ("CN", "Ningbo"): ["ningbo", "宁波"],
+    ("CN", "Qingdao"): ["qingdao", "青岛"],
+    ("CN", "Xiamen"): ["xiamen", "厦门"],
+    ("CN", "Zhuhai"): ["zhuhai", "珠海"],
+    ("CN", ""): ["mainland china", "china mainland", "chinese mainland", "中国大陆", "大陆"],
+
+    # 亚太
+    ("JP", "Tokyo"): ["tokyo", "东京"],
+    ("JP", ""): ["japan", "日本"],
+    ("KR", "Seoul"): ["seoul", "首尔"],
+    ("KR", ""): ["south korea", "korea", "韩国"],
+    ("MY", "Kuala Lumpur"): ["kuala lumpur", "吉隆坡"],
+    ("MY", ""): ["malaysia", "马来西亚"],
+    ("TH", "Bangkok"): ["bangkok", "曼谷"],
+    ("TH", ""): ["thailand", "泰国"],
+    ("VN", "Ho Chi Minh City"): ["ho chi minh city", "ho chi minh", "hcmc", "胡志明市"],
+    ("VN", "Hanoi"): ["hanoi", "河内"],
+    ("VN", ""): ["vietnam", "viet nam", "越南"],
+    ("ID", "Jakarta"): ["jakarta", "雅加达"],
+    ("ID", ""): ["indonesia", "印度尼西亚", "印尼"],
+    ("PH", "Manila"): ["manila", "马尼拉"],
+    ("PH", ""): ["philippines", "菲律宾"],
+    ("IN", "Bengaluru"): ["bengaluru", "bangalore"],
+    ("IN", ""): ["india", "印度"],
+    ("AU", "Sydney"): ["sydney", "悉尼"],
+    ("AU", "Melbourne"): ["melbourne", "墨尔本"],
+    ("AU", ""): ["australia", "澳大利亚"],
+    ("NZ", ""): ["new zealand", "新西兰"],
+    ("PK", ""): ["pakistan", "巴基斯坦"],
+    ("BD", ""): ["bangladesh", "孟加拉"],
+    ("LK", ""): ["sri lanka", "斯里兰卡"],
+    ("KH", ""): ["cambodia", "柬埔寨"],
+
+    # 中东、欧洲、美洲、非洲
+    ("AE", "Dubai"): ["dubai", "迪拜"],
+    ("AE", "Abu Dhabi"): ["abu dhabi", "阿布扎比"],
+    ("AE", ""): ["united arab emirates", "uae", "阿联酋"],
+    ("SA", "Riyadh"): ["riyadh", "利雅得"],
+    ("SA", ""): ["saudi arabia", "沙特阿拉伯", "沙特"],
+    ("BH", ""): ["bahrain", "巴林"],
+    ("QA", "Doha"): ["doha", "多哈"],
+    ("QA", ""): ["qatar", "卡塔尔"],
+    ("IL", "Tel Aviv"): ["tel aviv", "特拉维夫"],
+    ("IL", ""): ["israel", "以色列"],
+    ("TR", "Istanbul"): ["istanbul", "伊斯坦布尔"],
+    ("TR", ""): ["turkey", "türkiye", "turkiye", "土耳其"],
+    ("GB", "London"): ["london", "伦敦"],
+    ("GB", ""): ["united kingdom", "uk", "england", "英国"],
+    ("IE", "Dublin"): ["dublin", "都柏林"],
+    ("IE", ""): ["ireland", "爱尔兰"],
+    ("FR", "Paris"): ["paris", "巴黎"],
+    ("FR", ""): ["france", "法国"],
+    ("DE", "Berlin"): ["berlin", "柏林"],
+    ("DE", ""): ["germany", "德国"],
+    ("NL", "Amsterdam"): ["amsterdam", "阿姆斯特丹"],
+    ("NL", ""): ["netherlands", "荷兰"],
+    ("BE", "Brussels"): ["brussels", "布鲁塞尔"],
+    ("BE", ""): ["belgium", "比利时"],
+    ("LU", ""): ["luxembourg", "卢森堡"],
+    ("CH", "Zug"): ["zug", "楚格"],
+    ("CH", "Zurich"): ["zurich", "zürich", "苏黎世"],
+    ("CH", "Geneva"): ["geneva", "日内瓦"],
+    ("CH", ""): ["switzerland", "瑞士"],
+    ("AT", "Vienna"): ["vienna", "维也纳"],
+    ("AT", ""): ["austria", "奥地利"],
+    ("PL", "Warsaw"): ["warsaw", "华沙"],
+    ("PL", "Krakow"): ["krakow", "kraków"],
+    ("PL", ""): ["poland", "波兰"],
+    ("CZ", "Prague"): ["prague", "布拉格"],
+    ("CZ", ""): ["czech republic", "czechia", "捷克"],
+    ("LT", "Vilnius"): ["vilnius"],
+    ("LT", ""): ["lithuania", "立陶宛"],
+    ("LV", ""): ["latvia", "拉脱维亚"],
+    ("EE", "Tallinn"): ["tallinn"],
+    ("EE", ""): ["estonia", "爱沙尼亚"],
+    ("SE", ""): ["sweden", "瑞典"],
+    ("DK", ""): ["denmark", "丹麦"],
+    ("NO", ""): ["norway", "挪威"],
+    ("FI", ""): ["finland", "芬兰"],
+    ("PT", "Lisbon"): ["lisbon", "里斯本"],
+    ("PT", ""): ["portugal", "葡萄牙"],
+    ("ES", "Madrid"): ["madrid", "马德里"],
+    ("ES", "Barcelona"): ["barcelona", "巴塞罗那"],
+    ("ES", ""): ["spain", "西班牙"],
+    ("IT", "Milan"): ["milan", "米兰"],
+    ("IT", ""): ["italy", "意大利"],
+    ("MT", ""): ["malta", "马耳他"],
+    ("GI", ""): ["gibraltar", "直布罗陀"],
+    ("GR", ""): ["greece", "希腊"],
+    ("CY", "Limassol"): ["limassol"],
+    ("CY", ""): ["cyprus", "塞浦路斯"],
+    ("BG", "Sofia"): ["sofia"],
+    ("BG", ""): ["bulgaria", "保加利亚"],
+    ("RO", "Bucharest"): ["bucharest"],
+    ("RO", ""): ["romania", "罗马尼亚"],
+    ("RS", "Belgrade"): ["belgrade"],
+    ("RS", ""): ["serbia", "塞尔维亚"],
+    ("GE", "Tbilisi"): ["tbilisi"],
+    # 英文 "Georgia" 与美国州名相同，只收录中文
+    ("GE", ""): ["格鲁吉亚"],
+    ("AM", "Yerevan"): ["yerevan"],
+    ("AM", ""): ["armenia", "亚美尼亚"],
+    ("UA", "Kyiv"): ["kyiv", "kiev", "基辅"],
+    ("UA", ""): ["ukraine", "乌克兰"],
+    ("KZ", "Almaty"): ["almaty"],
+    ("KZ", ""): ["kazakhstan", "哈萨克斯坦"],
+    ("US", "New York"): ["new york", "nyc", "纽约"],
+    ("US", "San Francisco"): ["san francisco", "旧金山"],
+    ("US", ""): ["united states", "usa", "美国"],
+    ("CA", "Toronto"): ["toronto", "多伦多"],
+    ("CA", "Vancouver"): ["vancouver", "温哥华"],
+    ("CA", ""): ["canada", "加拿大"],
+    ("BR", "São Paulo"): ["são paulo", "sao paulo", "圣保罗"],
+    ("BR", ""): ["brazil", "巴西"],
+    ("AR", "Buenos Aires"): ["buenos aires"],
+    ("AR", ""): ["argentina", "阿根廷"],
+    ("MX", "Mexico City"): ["mexico city"],
+    ("MX", ""): ["mexico", "墨西哥"],
+    ("CO", ""): ["colombia", "哥伦比亚"],
+    ("CL", ""): ["chile", "智利"],
+    ("SV", ""): ["el salvador", "萨尔瓦多"],
+    ("BM", ""): ["bermuda", "百慕大"],
+    ("KY", ""): ["cayman islands", "开曼群岛"],
+    ("BS", ""): ["bahamas", "巴哈马"],
+    ("NG", "Lagos"): ["lagos"],
+    ("NG", ""): ["nigeria", "尼日利亚"],
+    ("KE", "Nairobi"): ["nairobi"],
+    ("KE", ""): ["kenya", "肯尼亚"],
+    ("ZA", "Cape Town"): ["cape town"],
+    ("ZA", ""): ["south africa", "南非"],
+    ("SC", ""): ["seychelles", "塞舌尔"],
+}
+
+REMOTE_ALIASES = ["remote", "fully remote", "work from home", "wfh", "anywhere", "远程", "居家办公"]
+
+# 爬虫猜测哪一行是地点时，带句末标点、词数较多且可识别地名覆盖率低于该值的行视为描述文字
+MIN_COVERAGE = 0.25
+PROSE_MIN_WORDS = 5
+SENTENCE_PUNCTUATION = ".!?;。！？；"
+
+_REMOTE = ("", "")
+
+
+class Location(NamedTuple):
+    """规范化后的地点"""
+    country: str = ""
+    city: str = ""
+    remote: bool = False
+    # 多地点职位 (如 "Singapore / Hong Kong") 的全部国家，按出现顺序
+    countries: Tuple[str, ...] = ()
+
+    @property
+    def known(self) -> bool:
+        return bool(self.countries) or self.remote
+
+
+UNKNOWN = Location()
+
+
+def _is_word_char(ch: str) -> bool:
+    """只有 ASCII 字母数字需要词边界，中文别名可以出现在任意位置"""
+    return ch.isascii() and ch.isalnum()
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _build_trie() -> Dict:
+    root: Dict = {}
+    entries = [(alias, place) for place, aliases in PLACES.items() for alias in aliases]
+    entries += [(alias, _REMOTE) for alias in REMOTE_ALIASES]
+    for alias, place in entries:
+        node = root
+        for ch in _normalize(alias):
+            node = node.setdefault(ch, {})
+        node[None] = place
+    return root
+
+
+_TRIE = _build_trie()
+
+
+def _scan(text: str) -> Tuple[List[Tuple[str, str]], int]:
+    """从左到右取最长匹配，返回匹配到的地点和匹配字符数"""
+    matches = []
+    matched_chars = 0
+    i, n = 0, len(text)
+
+    while i < n:
+        # 英文别名只能从词首开始匹配
+        if i > 0 and _is_word_char(text[i]) and _is_word_char(text[i - 1]):
+            i += 1
+            continue
+
+        node = _TRIE
+        best: Optional[Tuple[int, Tuple[str, str]]] = None
+        j = i
+        while j < n and text[j] in node:
+            node = node[text[j]]
+            j += 1
+            if None in node and not (j < n and _is_word_char(text[j]) and _is_word_char(text[j - 1])):
+                best = (j, node[None])
+
+        if best:
+            end, place = best
+            matches.append(place)
+            matched_chars += end - i
+            i = end
+        else:
+            i += 1
+
+    return matches, matched_chars
+
+
+@lru_cache(maxsize=8192)
+def canonicalize_location(text: str) -> Location:
+    """
+    把地点文本解析为 Location(country, city, remote, countries)
+
+    无法识别或 "Not specified" 时返回 UNKNOWN。只要命中别名就返回对应地点，
+    "Suzhou Industrial Park, Jiangsu Province, China" 这类长地址不能因为覆盖率低被丢掉。
+    """
+    if not text:
+        return UNKNOWN
+
+    matches, _ = _scan(_normalize(text))
+    if not matches:
+        return UNKNOWN
+
+    remote = _REMOTE in matches
+    places = [place for place in matches if place != _REMOTE]
+    countries = tuple(dict.fromkeys(country for country, _ in places))
+
+    # 主地点取第一个带城市的匹配，没有城市时取第一个国家
+    primary = next((place for place in places if place[1]), places[0] if places else _REMOTE)
+    return Location(country=primary[0], city=primary[1], remote=remote, countries=countries)
+
+
+def looks_like_prose(text: str) -> bool:
+    """可识别地名只占一小部分的句子 (如 "...comfortable in a fast-paced remote environment.")"""
+    normalized = _normalize(text)
+    if len(normalized.split()) < PROSE_MIN_WORDS or not any(ch in SENTENCE_PUNCTUATION for ch in normalized):
+        return False
+    _, matched_chars = _scan(normalized)
+    content_chars = sum(1 for ch in normalized if ch.isalnum())
+    return bool(content_chars) and matched_chars / content_chars < MIN_COVERAGE
+
+
+def looks_like_location(text: str) -> bool:
+    """爬虫解析卡片文本时判断某一行是否是地点，误解析进来的描述文字不算"""
+    text = text.strip()
+    return canonicalize_location(text).known and not looks_like_prose(text)
+
+
+if __name__ == "__main__":
+    # 回归检查: python -m scraper.gazetteer
+    locations = ["Poland", "France", "Germany", "Canada", "Ukraine", "Switzerland", "Turkey", "Lithuania",
+                 "Dublin, Ireland", "Hong Kong Science and Technology Park, Sha Tin, New Territories"]
+    not_locations = ["Engineering", "Not specified", "You are comfortable in a fast-paced remote environment.",
+                     "Detail-oriented, fast learner comfortable in a fast-paced remote environment."]
+    failed = [text for text in locations if not looks_like_location(text)]
+    failed += [text for text in not_locations if looks_like_location(text)]
+    for text in failed:
+        print(f"FAIL {text!r}")
+    total = len(locations) + len(not_locations)
+    print(f"{total - len(failed)}/{total} passed")
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,75 @@
+"""
+职位集合工具
+
+- job_id: 职位的稳定标识 (公司 + 链接 + 标题)
+- dedupe_jobs: 按 (标题, 地点) 去重，保留第一次出现的记录
+- diff_jobs: 比较两次结果，得到新增、删除和变化的职位
+- normalize_jobs: 抓取后统一整理字段 (把误放在 team 里的 "Posted on 日期" 移到 posted_date)
+"""
+import hashlib
+import re
+from typing import Dict, List, Sequence
+
+
+POSTED_RE = re.compile(r"(?:posted on|posted|发布于|发布时间)\s*[:：]?\s*(\d{4}[-/.]\d{1,2}[-/.]\d{1,2})", re.I)
+
+
+def job_id(job: Dict) -> str:
+    """生成职位的稳定短 ID"""
+    raw = "\n".join([job.get("company", ""), job.get("url", ""), job.get("title", "")])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+def dedupe_jobs(jobs: List[Dict], key_fields: Sequence[str] = ("title", "location")) -> List[Dict]:
+    """去重，保持原有顺序"""
+    seen = set()
+    unique_jobs = []
+    for job in jobs:
+        key = tuple(job.get(field, "") for field in key_fields)
+        if key not in seen:
+            seen.add(key)
+            unique_jobs.append(job)
+    return unique_jobs
+
+
+def diff_jobs(old: List[Dict], new: List[Dict]) -> Dict[str, List]:
+    """
+    比较两组职位
+
+    返回 {"added": [职位], "removed": [ID], "changed": [职位]}，
+    changed 表示 ID 相同但其他字段 (地点、部门、匹配原因等) 有变化。
+    """
+    old_by_id = {job_id(job): job for job in old}
+    new_by_id = {job_id(job): job for job in new}
+
+    added = [job for key, job in new_by_id.items() if key not in old_by_id]
+    removed = [key for key in old_by_id if key not in new_by_id]
+    changed = [
+        job for key, job in new_by_id.items()
+        if key in old_by_id and old_by_id[key] != job
+    ]
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def normalize_date(value: str) -> str:
+    """2025/9/7、2025.09.07 等统一为 2025-09-07"""
+    parts = re.split(r"[-/.]", value.strip()[:10])
+    if len(parts) == 3 and all(p.isdigit() for p in parts):
+        return f"{int(parts[0]):04d}-{int(parts[1]):02d}-{int(parts[2]):02d}"
+    return value
+
+
+def split_posted_team(job: Dict) -> Dict:
+    """把误放在 team 里的 "Posted on 日期" 移到 posted_date"""
+    match = POSTED_RE.search(job.get("team", ""))
+    if match:
+        job.setdefault("posted_date", normalize_date(match.group(1)))
+        job["team"] = ""
+    return job
+
+
+def normalize_jobs(jobs: List[Dict]) -> List[Dict]:
+    """原地整理抓取结果，爬虫输出和旧快照都经过这里，与是否补全详情无关"""
+    for job in jobs:
+        split_posted_team(job)
+    return jobs
@@ -5,575 +5,360 @@ Job Aggregator - 招聘信息聚合工具
 1. 地点在香港
 2. 面向应届生且地点不在中国大陆
 """
+import argparse
 import asyncio
 import json
 import os
+import sys
 from datetime import datetime
-from typing import List, Dict
-
-from scraper import scrape_binance, scrape_okx, scrape_bitget
-
-
-# 中国大陆城市关键词（用于排除）
-MAINLAND_CHINA_KEYWORDS = [
-    "beijing", "shanghai", "shenzhen", "guangzhou", "hangzhou",
-    "chengdu", "nanjing", "wuhan", "xian", "suzhou", "tianjin",
-    "chongqing", "dongguan", "foshan", "ningbo", "qingdao",
-    "北京", "上海", "深圳", "广州", "杭州", "成都", "南京",
-    "武汉", "西安", "苏州", "天津", "重庆", "东莞", "佛山",
-    "宁波", "青岛", "mainland china", "china mainland", "中国大陆"
-]
-
-# 香港关键词
-HONG_KONG_KEYWORDS = ["hong kong", "hongkong", "hk", "香港"]
+from functools import partial
+from typing import List, Dict, Optional
+
+from scraper.adaptive import CrawlPlanner
+from scraper.browser import DEFAULT_PAGE_MEMORY_BYTES, configure_memory, configure_profiles
+from scraper.daemon import DEFAULT_HOST, DEFAULT_INTERVAL, DEFAULT_PORT, Daemon
+from scraper.enrich import EnrichmentCache, enrich_jobs
+from scraper.feed import assign_ids, update_feed
+from scraper.registry import discover_sources, get_source, select_sources
+from scraper.parallel import filter_jobs_parallel, generate_html_parallel
+from scraper.scheduler import RUN_DEADLINE, SiteResult, run_sites, load_previous_jobs
+from scraper.snapshot import load_latest_jobs, load_snapshot, resolve_snapshot, save_snapshot
+from scraper.workqueue import WorkQueue, merge_results, run_worker, wait_for_run
+
+
+# 跨运行复用的本地缓存目录 (不提交，由 workflow 的 actions/cache 保存和恢复)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Job Aggregator")
+    parser.add_argument("--only", action="append", default=[], metavar="NAMES",
+                        help="只处理这些数据源 (逗号分隔，可重复)")
+    parser.add_argument("--skip", action="append", default=[], metavar="NAMES",
+                        help="跳过这些数据源 (逗号分隔，可重复)")
+    parser.add_argument("--list-sources", action="store_true",
+                        help="列出已注册的数据源后退出")
+    parser.add_argument("--from-snapshot", nargs="?", const="latest", metavar="PATH",
+                        help="不抓取，从原始快照重新筛选并生成输出 (默认最新快照)")
+    parser.add_argument("--output-dir", metavar="DIR",
+                        help="输出目录 (默认 output/，快照始终保存在 .cache/raw/)")
+    parser.add_argument("--no-enrich", action="store_true",
+                        help="不抓取详情页补全缺失的地点")
+    parser.add_argument("--daemon", action="store_true",
+                        help="常驻运行，复用浏览器按间隔抓取，并在本地提供 HTTP 接口")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="daemon 监听地址")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="daemon 监听端口")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, metavar="SECONDS",
+                        help="daemon 默认抓取间隔")
+    parser.add_argument("--source-interval", action="append", default=[], metavar="NAME=SECONDS",
+                        help="单个数据源的抓取间隔 (可重复)")
+    parser.add_argument("--no-browser-cache", action="store_true",
+                        help="不使用 .cache/browser 下的持久化浏览器配置和磁盘缓存")
+    parser.add_argument("--page-memory-mb", type=int, default=DEFAULT_PAGE_MEMORY_BYTES // (1024 * 1024),
+                        metavar="MB", help="单个页面的 JS 堆预算，超出时提前结束该页的提取 (0 不限制)")
+    parser.add_argument("--prune-dom", action="store_true",
+                        help="提取后从页面 DOM 中删除已处理的职位卡片，限制无限滚动页面的内存")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="按各数据源的历史变化率决定是否抓取，未到期或探测未变化的沿用上次结果")
+    parser.add_argument("--workers", type=int, metavar="N",
+                        help="筛选和渲染的进程数 (默认按数据量自动选择，1 为单进程)")
+    parser.add_argument("--columnar", action="store_true",
+                        help="用 NumPy 列式筛选 (适合从大量快照回填，未安装 NumPy 时退回逐条筛选)")
+    parser.add_argument("--coordinator", action="store_true",
+                        help="把抓取任务写入队列，等待 worker 执行后合并结果")
+    parser.add_argument("--worker", action="store_true",
+                        help="从队列领取抓取任务执行，队列空闲一段时间后退出")
+    parser.add_argument("--queue", metavar="PATH",
+                        help="任务队列 SQLite 文件 (默认 .cache/queue.sqlite，多机时放在共享目录)")
+    parser.add_argument("--local-workers", type=int, default=0, metavar="N",
+                        help="coordinator 在本机额外启动 N 个 worker 进程")
+    parser.add_argument("--worker-concurrency", type=int, default=1, metavar="N",
+                        help="每个 worker 同时执行的任务数")
+    args = parser.parse_args(argv)
+    args.only = [n.strip() for v in args.only for n in v.split(",") if n.strip()]
+    args.skip = [n.strip() for v in args.skip for n in v.split(",") if n.strip()]
+    for name in args.only + args.skip:
+        try:
+            get_source(name)
+        except KeyError:
+            known = ", ".join(source.name for source in discover_sources())
+            parser.error(f"unknown source {name!r} (known: {known})")
+
+    args.source_intervals = {}
+    for value in args.source_interval:
+        name, sep, seconds = value.partition("=")
+        try:
+            args.source_intervals[name.strip()] = float(seconds)
+        except ValueError:
+            sep = ""
+        if not sep:
+            parser.error(f"invalid --source-interval {value!r}, expected NAME=SECONDS")
+    return args
+
+
+def select_filter(args: argparse.Namespace):
+    """按命令行参数选择筛选实现"""
+    if args.columnar:
+        # NumPy 只在需要时导入，其他模式的冷启动保持只用标准库
+        from scraper.columnar import filter_jobs_columnar
+        return filter_jobs_columnar
+    return partial(filter_jobs_parallel, workers=args.workers)
+
+
+def print_results(results: List[SiteResult]):
+    """打印每个数据源的抓取结果"""
+    for result in results:
+        if result.status == "ok":
+            print(f"  - {result.name}: {len(result.jobs)} jobs found ({result.elapsed:.0f}s, {result.attempts} attempt(s))")
+        elif result.status == "stale":
+            print(f"  - {result.name}: Error - {result.error}, reusing {len(result.jobs)} jobs from last run (stale)")
+        else:
+            print(f"  - {result.name}: Error - {result.error}")
 
-# 应届生/校招关键词
-GRADUATE_KEYWORDS = [
-    "graduate", "new grad", "new graduate", "fresh graduate",
-    "entry level", "entry-level", "junior", "campus",
-    "university", "intern to full", "graduate program",
-    "应届", "校招", "毕业生", "实习转正", "管培"
-]
 
+async def scrape_sources(sources, previous: Dict[str, List[Dict]]):
+    """调度抓取选中的数据源，返回 SiteResult 列表"""
+    results = await run_sites(
+        {source.name: source.scrape for source in sources},
+        previous=previous,
+        budgets={source.name: source.budget for source in sources},
+    )
+    print_results(results)
+    return results
+
+
+async def coordinate_sources(sources, previous: Dict[str, List[Dict]], args: argparse.Namespace):
+    """把数据源写入任务队列，等待 worker 执行完后按顺序合并"""
+    queue = WorkQueue(args.queue)
+    try:
+        queue.purge()
+        run_id = queue.enqueue(sources, RUN_DEADLINE)
+        print(f"  - Queued {len(sources)} sources (run {run_id}, queue {args.queue})")
+
+        # 本机 worker 使用与 coordinator 相同的浏览器和内存设置
+        command = [sys.executable, os.path.abspath(__file__), "--worker", "--queue", args.queue,
+                   "--worker-concurrency", str(args.worker_concurrency),
+                   "--page-memory-mb", str(args.page_memory_mb)]
+        if args.no_browser_cache:
+            command.append("--no-browser-cache")
+        if args.prune_dom:
+            command.append("--prune-dom")
+        local_workers = [await asyncio.create_subprocess_exec(*command) for _ in range(args.local_workers)]
+
+        progress = await wait_for_run(queue, run_id, RUN_DEADLINE)
+        print(f"  - Queue finished: {', '.join(f'{k}={v}' for k, v in sorted(progress.items()))}")
+        # 本机 worker 在队列空闲后会自行退出，这里不必等它们的空闲超时
+        for process in local_workers:
+            if process.returncode is None:
+                process.terminate()
+            await process.wait()
+
+        results = merge_results(queue, run_id, previous)
+    finally:
+        queue.close()
+
+    print_results(results)
+    return results
+
+
+async def enrich_sources(results, cache_path: str):
+    """抓详情补全缺失地点的职位，失败不影响主流程"""
+    cache = EnrichmentCache(cache_path)
+    try:
+        stats = await enrich_jobs([job for result in results for job in result.jobs], cache=cache)
+    except Exception as e:
+        print(f"  - Enrichment: Error - {e}")
+        return
+    finally:
+        cache.save()
+
+    print(f"  - Enrichment: {stats['candidates']} jobs missing location, "
+          f"{stats['cached']} from cache, {stats['fetched']} fetched, "
+          f"{stats['filled']} filled, {stats['failed']} not found")
+
+
+def load_snapshot_jobs(path: str, only: List[str], skip: List[str]) -> Dict[str, List[Dict]]:
+    """从快照读取各站点原始职位，按 --only / --skip 过滤"""
+    snapshot = load_snapshot(path)
+    only_names = {n.lower() for n in only}
+    skip_names = {n.lower() for n in skip}
+
+    jobs_by_source = {}
+    for name, source in snapshot["sources"].items():
+        if (only_names and name.lower() not in only_names) or name.lower() in skip_names:
+            continue
+        print(f"  - {name}: {len(source['jobs'])} jobs ({source['status']})")
+        jobs_by_source[name] = source["jobs"]
 
-def is_in_hong_kong(location: str) -> bool:
-    """检查是否在香港"""
-    location_lower = location.lower()
-    return any(kw in location_lower for kw in HONG_KONG_KEYWORDS)
+    print(f"  - Snapshot: {path} ({snapshot['created_at']})")
+    return jobs_by_source
 
 
-def is_in_mainland_china(location: str) -> bool:
-    """检查是否在中国大陆"""
-    location_lower = location.lower()
-    return any(kw in location_lower for kw in MAINLAND_CHINA_KEYWORDS)
+def write_outputs(filtered_jobs: List[Dict], stale_companies: List[str], output_dir: str,
+                  workers: Optional[int] = None):
+    """写出 jobs.json、增量 feed 和 index.html"""
+    # 复制后再加 id，daemon 传入的是 ResultCache 中缓存的列表，不能改动
+    filtered_jobs = assign_ids([dict(job) for job in filtered_jobs])
+    json_path = os.path.join(output_dir, "jobs.json")
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "update_time": datetime.now().isoformat(),
+            "total_count": len(filtered_jobs),
+            "stale_companies": stale_companies,
+            "jobs": filtered_jobs
+        }, f, ensure_ascii=False, indent=2)
+    print(f"  - JSON: {json_path}")
 
+    feed_dir = os.path.join(output_dir, "feed")
+    version = update_feed(filtered_jobs, feed_dir)
+    print(f"  - Feed: {feed_dir} (version {version})")
 
-def is_graduate_position(title: str, team: str = "") -> bool:
-    """检查是否是应届生/校招职位"""
-    text = f"{title} {team}".lower()
-    return any(kw in text for kw in GRADUATE_KEYWORDS)
+    html_path = os.path.join(output_dir, "index.html")
+    generate_html_parallel(filtered_jobs, html_path, workers, version)
+    print(f"  - HTML: {html_path}")
 
 
-def filter_jobs(jobs: List[Dict]) -> List[Dict]:
-    """
-    筛选职位:
-    条件1: 地点在香港
-    条件2: 面向应届生且地点不在中国大陆
+async def run_daemon(args: argparse.Namespace, output_dir: str, snapshot_dir: str, enrich_cache_path: str):
+    """常驻模式: 每次结果变化时同时写出快照和页面"""
+    def publish(results, filtered_jobs, stale_companies):
+        save_snapshot(results, snapshot_dir)
+        write_outputs(filtered_jobs, stale_companies, output_dir, args.workers)
+
+    previous = load_latest_jobs(snapshot_dir)
+    if previous is None:
+        previous = load_previous_jobs(os.path.join(output_dir, "jobs.json"))
+
+    daemon = Daemon(
+        select_sources(args.only, args.skip),
+        filter_jobs=select_filter(args),
+        intervals=args.source_intervals,
+        default_interval=args.interval,
+        previous=previous,
+        publish=publish,
+        enrich_cache=None if args.no_enrich else EnrichmentCache(enrich_cache_path),
+        planner=CrawlPlanner(os.path.join(CACHE_DIR, "crawl_state.json")) if args.adaptive else None,
+    )
+    await daemon.run(args.host, args.port)
 
-    满足任一条件即可
-    """
-    filtered = []
 
-    for job in jobs:
-        location = job.get("location", "")
-        title = job.get("title", "")
-        team = job.get("team", "")
+async def main(args: Optional[argparse.Namespace] = None):
+    """主函数"""
+    args = args or parse_args([])
 
-        # 条件1: 香港职位
-        if is_in_hong_kong(location):
-            job["match_reason"] = "Location: Hong Kong"
-            filtered.append(job)
-            continue
+    if args.list_sources:
+        for source in discover_sources():
+            missing = source.missing_requirements()
+            status = f"missing: {', '.join(missing)}" if missing else "ready"
+            print(f"{source.name:<10} {'/'.join(source.strategies) or '-':<12} {status}")
+        return
 
-        # 条件2: 应届生职位且不在大陆
-        if is_graduate_position(title, team) and not is_in_mainland_china(location):
-            job["match_reason"] = "Graduate position (non-mainland)"
-            filtered.append(job)
-            continue
-
-    return filtered
-
-
-def generate_html(jobs: List[Dict], output_path: str):
-    """生成 HTML 展示页面"""
-    # 按公司分组
-    jobs_by_company = {}
-    for job in jobs:
-        company = job.get("company", "Unknown")
-        if company not in jobs_by_company:
-            jobs_by_company[company] = []
-        jobs_by_company[company].append(job)
-
-    update_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
-
-    html_content = f'''<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Crypto Jobs - HK & Graduate Positions</title>
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600&family=Space+Grotesk:wght@500;700&display=swap" rel="stylesheet">
-    <style>
-        :root {{
-            --bg-color: #050505;
-            --card-bg: #0a0a0a;
-            --card-border: #1f1f1f;
-            --text-primary: #ededed;
-            --text-secondary: #a1a1aa;
-            --accent-start: #3b82f6;
-            --accent-end: #8b5cf6;
-            --hover-border: #3f3f46;
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Inter', sans-serif;
-            background-color: var(--bg-color);
-            background-image: 
-                radial-gradient(circle at 15% 50%, rgba(59, 130, 246, 0.08), transparent 25%),
-                radial-gradient(circle at 85% 30%, rgba(139, 92, 246, 0.08), transparent 25%);
-            min-height: 100vh;
-            color: var(--text-primary);
-            padding: 40px 20px;
-            line-height: 1.6;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-
-        header {{
-            text-align: center;
-            margin-bottom: 60px;
-            position: relative;
-        }}
-
-        h1 {{
-            font-family: 'Space Grotesk', sans-serif;
-            font-size: 3.5rem;
-            font-weight: 700;
-            letter-spacing: -0.05em;
-            background: linear-gradient(135deg, #fff 30%, #a1a1aa);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 16px;
-        }}
-
-        .subtitle {{
-            color: var(--text-secondary);
-            font-size: 1.1rem;
-            max-width: 600px;
-            margin: 0 auto;
-        }}
-
-        .update-time {{
-            display: inline-block;
-            margin-top: 16px;
-            padding: 4px 12px;
-            border-radius: 9999px;
-            background: rgba(255, 255, 255, 0.03);
-            border: 1px solid rgba(255, 255, 255, 0.05);
-            color: #71717a;
-            font-size: 0.75rem;
-            font-family: 'Space Grotesk', sans-serif;
-        }}
-
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 20px;
-            margin-bottom: 60px;
-            max-width: 800px;
-            margin-left: auto;
-            margin-right: auto;
-        }}
-
-        .stat-item {{
-            background: rgba(255, 255, 255, 0.02);
-            border: 1px solid var(--card-border);
-            padding: 24px;
-            border-radius: 16px;
-            text-align: center;
-            transition: all 0.3s ease;
-        }}
-
-        .stat-item:hover {{
-            border-color: var(--hover-border);
-            transform: translateY(-2px);
-        }}
-
-        .stat-number {{
-            font-family: 'Space Grotesk', sans-serif;
-            font-size: 2.5rem;
-            font-weight: 700;
-            color: #fff;
-            margin-bottom: 4px;
-        }}
-
-        .stat-label {{
-            color: var(--text-secondary);
-            font-size: 0.875rem;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-        }}
-
-        .filters {{
-            display: flex;
-            justify-content: center;
-            gap: 12px;
-            margin-bottom: 50px;
-            flex-wrap: wrap;
-        }}
-
-        .filter-btn {{
-            padding: 10px 24px;
-            border: 1px solid var(--card-border);
-            border-radius: 9999px;
-            background: transparent;
-            color: var(--text-secondary);
-            font-family: 'Space Grotesk', sans-serif;
-            font-weight: 500;
-            cursor: pointer;
-            transition: all 0.3s ease;
-        }}
-
-        .filter-btn:hover {{
-            border-color: #fff;
-            color: #fff;
-        }}
-
-        .filter-btn.active {{
-            background: #fff;
-            color: #000;
-            border-color: #fff;
-        }}
-
-        .company-section {{
-            margin-bottom: 60px;
-            animation: fadeIn 0.5s ease-out;
-        }}
-
-        .company-header {{
-            display: flex;
-            align-items: baseline;
-            gap: 16px;
-            margin-bottom: 24px;
-            padding-left: 8px;
-            border-left: 2px solid var(--accent-start);
-        }}
-
-        .company-name {{
-            font-family: 'Space Grotesk', sans-serif;
-            font-size: 1.75rem;
-            color: #fff;
-            font-weight: 600;
-        }}
-
-        .company-count {{
-            color: var(--text-secondary);
-            font-size: 0.9rem;
-        }}
-
-        .job-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fill, minmax(340px, 1fr));
-            gap: 20px;
-        }}
-
-        .job-card {{
-            background: var(--card-bg);
-            border: 1px solid var(--card-border);
-            border-radius: 16px;
-            padding: 24px;
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            position: relative;
-            overflow: hidden;
-            display: flex;
-            flex-direction: column;
-            justify-content: space-between;
-        }}
-
-        .job-card::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            background: linear-gradient(135deg, rgba(59, 130, 246, 0.05), rgba(139, 92, 246, 0.05));
-            opacity: 0;
-            transition: opacity 0.3s ease;
-        }}
-
-        .job-card:hover {{
-            transform: translateY(-4px);
-            border-color: var(--hover-border);
-            box-shadow: 0 20px 40px -15px rgba(0, 0, 0, 0.5);
-        }}
-
-        .job-card:hover::before {{
-            opacity: 1;
-        }}
-
-        .job-title {{
-            font-size: 1.1rem;
-            font-weight: 500;
-            margin-bottom: 16px;
-            line-height: 1.4;
-            position: relative;
-            z-index: 1;
-        }}
-
-        .job-title a {{
-            color: #fff;
-            text-decoration: none;
-            transition: color 0.2s;
-        }}
-
-        .job-title a:hover {{
-            color: #60a5fa;
-        }}
-
-        .job-meta {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 8px;
-            position: relative;
-            z-index: 1;
-            margin-top: auto;
-        }}
-
-        .job-tag {{
-            padding: 6px 12px;
-            border-radius: 6px;
-            font-size: 0.75rem;
-            font-weight: 500;
-            letter-spacing: 0.02em;
-        }}
-
-        .tag-location {{
-            background: rgba(59, 130, 246, 0.1);
-            color: #60a5fa;
-            border: 1px solid rgba(59, 130, 246, 0.2);
-        }}
-
-        .tag-team {{
-            background: rgba(139, 92, 246, 0.1);
-            color: #a78bfa;
-            border: 1px solid rgba(139, 92, 246, 0.2);
-        }}
-
-        .tag-reason {{
-            background: rgba(16, 185, 129, 0.1);
-            color: #34d399;
-            border: 1px solid rgba(16, 185, 129, 0.2);
-        }}
-
-        .no-jobs {{
-            text-align: center;
-            padding: 80px 20px;
-            color: var(--text-secondary);
-        }}
-
-        footer {{
-            text-align: center;
-            padding: 60px 20px;
-            color: #52525b;
-            font-size: 0.875rem;
-            border-top: 1px solid var(--card-border);
-            margin-top: 60px;
-        }}
-
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
-
-        @media (max-width: 768px) {{
-            h1 {{ font-size: 2.5rem; }}
-            .stats {{ grid-template-columns: 1fr; }}
-            .container {{ padding: 20px; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>Crypto Jobs Aggregator</h1>
-            <p class="subtitle">Hong Kong & Graduate Positions | Binance, OKX, Bitget</p>
-            <p class="update-time">Last updated: {update_time}</p>
-        </header>
-
-        <div class="stats">
-            <div class="stat-item">
-                <div class="stat-number">{len(jobs)}</div>
-                <div class="stat-label">Total Positions</div>
-            </div>
-            <div class="stat-item">
-                <div class="stat-number">{len([j for j in jobs if 'Hong Kong' in j.get('match_reason', '')])}</div>
-                <div class="stat-label">Hong Kong</div>
-            </div>
-            <div class="stat-item">
-                <div class="stat-number">{len([j for j in jobs if 'Graduate' in j.get('match_reason', '')])}</div>
-                <div class="stat-label">Graduate</div>
-            </div>
-        </div>
-
-        <div class="filters">
-            <button class="filter-btn active" onclick="filterJobs('all')">All</button>
-            <button class="filter-btn" onclick="filterJobs('hk')">Hong Kong</button>
-            <button class="filter-btn" onclick="filterJobs('graduate')">Graduate</button>
-'''
-
-    # 添加公司筛选按钮
-    for company in jobs_by_company.keys():
-        html_content += f'            <button class="filter-btn" onclick="filterJobs(\'{company.lower()}\')">{company}</button>\n'
-
-    html_content += '''        </div>
-
-        <main id="jobs-container">
-'''
-
-    if not jobs:
-        html_content += '''            <div class="no-jobs">
-                <h2>No matching jobs found</h2>
-                <p>Check back later for new opportunities</p>
-            </div>
-'''
-    else:
-        for company, company_jobs in jobs_by_company.items():
-            html_content += f'''            <div class="company-section" data-company="{company.lower()}">
-                <div class="company-header">
-                    <h2 class="company-name">{company}</h2>
-                    <span class="company-count">{len(company_jobs)} positions</span>
-                </div>
-                <div class="job-grid">
-'''
-            for job in company_jobs:
-                reason_class = "hk" if "Hong Kong" in job.get("match_reason", "") else "graduate"
-                html_content += f'''                    <div class="job-card" data-type="{reason_class}">
-                        <h3 class="job-title">
-                            <a href="{job.get('url', '#')}" target="_blank" rel="noopener">{job.get('title', 'Unknown Position')}</a>
-                        </h3>
-                        <div class="job-meta">
-                            <span class="job-tag tag-location">{job.get('location', 'N/A')}</span>
-                            {f'<span class="job-tag tag-team">{job.get("team")}</span>' if job.get('team') else ''}
-                            <span class="job-tag tag-reason">{job.get('match_reason', '')}</span>
-                        </div>
-                    </div>
-'''
-            html_content += '''                </div>
-            </div>
-'''
-
-    html_content += '''        </main>
-
-        <footer>
-            <p>Auto-updated daily via GitHub Actions</p>
-            <p>Data sourced from official career pages</p>
-        </footer>
-    </div>
-
-    <script>
-        function filterJobs(type) {
-            // Update button states
-            document.querySelectorAll('.filter-btn').forEach(btn => {
-                btn.classList.remove('active');
-                if (btn.textContent.toLowerCase() === type ||
-                    (type === 'all' && btn.textContent === 'All') ||
-                    (type === 'hk' && btn.textContent === 'Hong Kong') ||
-                    (type === 'graduate' && btn.textContent === 'Graduate')) {
-                    btn.classList.add('active');
-                }
-            });
-
-            // Filter jobs
-            const sections = document.querySelectorAll('.company-section');
-            const cards = document.querySelectorAll('.job-card');
-
-            if (type === 'all') {
-                sections.forEach(s => s.style.display = 'block');
-                cards.forEach(c => c.style.display = 'block');
-            } else if (type === 'hk' || type === 'graduate') {
-                sections.forEach(s => s.style.display = 'block');
-                cards.forEach(card => {
-                    card.style.display = card.dataset.type === type ? 'block' : 'none';
-                });
-                // Hide empty sections
-                sections.forEach(section => {
-                    const visibleCards = section.querySelectorAll('.job-card[style="display: block"]');
-                    section.style.display = visibleCards.length > 0 ? 'block' : 'none';
-                });
-            } else {
-                // Company filter
-                sections.forEach(section => {
-                    section.style.display = section.dataset.company === type ? 'block' : 'none';
-                });
-                cards.forEach(c => c.style.display = 'block');
-            }
-        }
-    </script>
-</body>
-</html>'''
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
-
-
-async def main():
-    """主函数"""
     print("=" * 50)
     print("Job Aggregator - Starting...")
     print("=" * 50)
 
     # 确保输出目录存在
-    output_dir = os.path.join(os.path.dirname(__file__), "output")
+    default_output_dir = os.path.join(os.path.dirname(__file__), "output")
+    output_dir = args.output_dir or default_output_dir
+    # 原始快照比 jobs.json 大得多，放在缓存目录里，不随 output/ 提交和发布
+    snapshot_dir = os.path.join(CACHE_DIR, "raw")
+    enrich_cache_path = os.path.join(CACHE_DIR, "enrich.json")
     os.makedirs(output_dir, exist_ok=True)
+    args.queue = args.queue or os.path.join(CACHE_DIR, "queue.sqlite")
+    configure_profiles(None if args.no_browser_cache else os.path.join(CACHE_DIR, "browser"))
+    configure_memory(args.page_memory_mb * 1024 * 1024, args.prune_dom)
+
+    if args.worker:
+        queue = WorkQueue(args.queue)
+        try:
+            completed = await run_worker(queue, concurrency=args.worker_concurrency)
+        finally:
+            queue.close()
+        print(f"Worker finished {completed} task(s)")
+        return
+
+    if args.daemon:
+        await run_daemon(args, output_dir, snapshot_dir, enrich_cache_path)
+        return
+
+    if args.from_snapshot:
+        print("\n[1/4] Loading raw snapshot...")
+        path = resolve_snapshot(args.from_snapshot, snapshot_dir)
+        jobs_by_source = load_snapshot_jobs(path, args.only, args.skip)
+
+        # 与抓取时一样，未选中的数据源沿用上次的结果，避免 --only 把其他公司从页面和 feed 中删掉
+        if args.only or args.skip:
+            previous = load_latest_jobs(snapshot_dir)
+            if previous is None:
+                previous = load_previous_jobs(os.path.join(output_dir, "jobs.json"))
+            for company, jobs in previous.items():
+                if company not in jobs_by_source:
+                    print(f"  - {company}: not selected, keeping {len(jobs)} jobs from last run")
+                    jobs_by_source[company] = jobs
+    else:
+        # 并发抓取选中的网站
+        print("\n[1/4] Scraping job listings...")
+        sources = select_sources(args.only, args.skip)
+
+        # 失败站点优先回退到上次的原始快照，没有快照时用上次的筛选结果
+        previous = load_latest_jobs(snapshot_dir)
+        if previous is None:
+            previous = load_previous_jobs(os.path.join(output_dir, "jobs.json"))
+
+        planner = None
+        if args.adaptive:
+            planner = CrawlPlanner(os.path.join(CACHE_DIR, "crawl_state.json"))
+            due, reasons = await planner.plan(sources)
+            for source in sources:
+                print(f"  - {source.name}: {'scrape' if source in due else 'skip'} ({reasons[source.name]})")
+            if not due:
+                planner.save()
+                print("\nNo source is due, outputs left unchanged")
+                return
+            sources = due
+
+        if args.coordinator:
+            results = await coordinate_sources(sources, previous, args)
+        else:
+            results = await scrape_sources(sources, previous)
 
-    # 并发抓取所有网站
-    print("\n[1/4] Scraping job listings...")
+        if planner is not None:
+            for result in results:
+                planner.record(result.name, result.status, result.jobs)
+            planner.save()
 
-    results = await asyncio.gather(
-        scrape_binance(),
-        scrape_okx(),
-        scrape_bitget(),
-        return_exceptions=True
-    )
+        # 未选中的数据源沿用上次的结果，避免 --only 把其他公司从页面上清掉
+        scraped = {result.name for result in results}
+        for company, jobs in previous.items():
+            if company not in scraped:
+                print(f"  - {company}: skipped, keeping {len(jobs)} jobs from last run")
+                results.append(SiteResult(name=company, jobs=jobs, status="skipped"))
 
-    all_jobs = []
-    scrapers = ["Binance", "OKX", "Bitget"]
+        if not args.no_enrich:
+            await enrich_sources(results, enrich_cache_path)
 
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            print(f"  - {scrapers[i]}: Error - {result}")
-        else:
-            print(f"  - {scrapers[i]}: {len(result)} jobs found")
-            all_jobs.extend(result)
+        jobs_by_source = {result.name: result.jobs for result in results}
+        snapshot_path = save_snapshot(results, snapshot_dir)
+        print(f"  - Raw snapshot: {snapshot_path}")
+
+    all_jobs = [job for jobs in jobs_by_source.values() for job in jobs]
+    stale_companies = [
+        name for name, jobs in jobs_by_source.items()
+        if any(job.get("stale") for job in jobs)
+    ]
 
     print(f"\n[2/4] Total jobs scraped: {len(all_jobs)}")
 
-    # 筛选
+    # 筛选 (复制一份，避免 match_reason 写回快照中的原始记录)；进程池在线程中等待，不阻塞事件循环
     print("\n[3/4] Filtering jobs...")
-    filtered_jobs = filter_jobs(all_jobs)
+    filtered_jobs = await asyncio.to_thread(select_filter(args), [dict(job) for job in all_jobs])
     print(f"  - Matching jobs: {len(filtered_jobs)}")
     print(f"    - Hong Kong: {len([j for j in filtered_jobs if 'Hong Kong' in j.get('match_reason', '')])}")
     print(f"    - Graduate (non-mainland): {len([j for j in filtered_jobs if 'Graduate' in j.get('match_reason', '')])}")
 
     # 保存结果
     print("\n[4/4] Generating output files...")
-
-    # JSON
-    json_path = os.path.join(output_dir, "jobs.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump({
-            "update_time": datetime.now().isoformat(),
-            "total_count": len(filtered_jobs),
-            "jobs": filtered_jobs
-        }, f, ensure_ascii=False, indent=2)
-    print(f"  - JSON: {json_path}")
-
-    # HTML
-    html_path = os.path.join(output_dir, "index.html")
-    generate_html(filtered_jobs, html_path)
-    print(f"  - HTML: {html_path}")
+    await asyncio.to_thread(write_outputs, filtered_jobs, stale_companies, output_dir, args.workers)
 
     print("\n" + "=" * 50)
     print("Done!")
@@ -581,4 +366,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    asyncio.run(main(parse_args()))
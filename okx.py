@@ -3,22 +3,29 @@ OKX 招聘页面爬虫
 URL: https://www.okx.com/zh-hans/join-us/openings
 """
 import asyncio
-from playwright.async_api import async_playwright
 from typing import List, Dict
 
+from .browser import collect_cards, open_page
+from .gazetteer import looks_like_location
+from .jobset import dedupe_jobs
 
-async def scrape_okx() -> List[Dict]:
-    """抓取 OKX 招聘信息"""
+SOURCE = {
+    "name": "OKX",
+    "entry": "scrape_okx",
+    "strategies": {"browser": "scrape_okx"},
+    "requires": ["playwright"],
+    "budget": 240,
+    "order": 20,
+    "probe": "https://boards-api.greenhouse.io/v1/boards/okx/jobs",
+}
+
+
+async def scrape_okx(browser=None) -> List[Dict]:
+    """抓取 OKX 招聘信息，传入 browser 时复用已启动的浏览器"""
     jobs = []
     url = "https://www.okx.com/join-us/openings"  # 使用英文版
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        )
-        page = await context.new_page()
-
+    async with open_page(browser) as page:
         try:
             await page.goto(url, wait_until="networkidle", timeout=60000)
 
@@ -28,8 +35,8 @@ async def scrape_okx() -> List[Dict]:
             # 尝试点击 "Show all" 或加载更多按钮
             for _ in range(10):
                 try:
-                    load_more = await page.query_selector('button:has-text("Load more"), button:has-text("Show all"), [class*="load-more"]')
-                    if load_more:
+                    load_more = page.locator('button:has-text("Load more"), button:has-text("Show all"), [class*="load-more"]').first
+                    if await load_more.count():
                         await load_more.click()
                         await asyncio.sleep(1)
                     else:
@@ -37,25 +44,19 @@ async def scrape_okx() -> List[Dict]:
                 except Exception:
                     break
 
-            # 滚动加载
-            for _ in range(10):
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(0.5)
-
-            # 获取职位信息 - OKX 通常使用卡片式布局
-            job_cards = await page.query_selector_all('[class*="job"], [class*="position"], [class*="opening"], a[href*="/job/"]')
+            # 获取职位信息 - OKX 通常使用卡片式布局，边滚动边分批提取
+            cards = await collect_cards(
+                page,
+                '[class*="job"], [class*="position"], [class*="opening"], a[href*="/job/"]',
+                scrolls=10,
+                scroll_pause=0.5,
+            )
 
-            for card in job_cards:
+            for card in cards:
                 try:
-                    # 尝试获取链接
-                    link = await card.get_attribute("href")
-                    if not link:
-                        link_elem = await card.query_selector("a")
-                        if link_elem:
-                            link = await link_elem.get_attribute("href")
-
-                    text = await card.inner_text()
-                    lines = [l.strip() for l in text.split('\n') if l.strip()]
+                    # 卡片自身或其中第一个链接
+                    link = card["href"]
+                    lines = [l.strip() for l in card["text"].split('\n') if l.strip()]
 
                     if len(lines) >= 1:
                         title = lines[0]
@@ -64,7 +65,7 @@ async def scrape_okx() -> List[Dict]:
 
                         # 尝试从文本中提取地点
                         for line in lines[1:]:
-                            if any(loc in line.lower() for loc in ["hong kong", "singapore", "remote", "beijing", "shanghai", "shenzhen"]):
+                            if looks_like_location(line):
                                 location = line
                                 break
                             elif not team:
@@ -86,11 +87,11 @@ async def scrape_okx() -> List[Dict]:
 
             # 如果上面的选择器没找到，尝试更通用的方法
             if not jobs:
-                all_links = await page.query_selector_all('a[href*="job"], a[href*="position"], a[href*="opening"]')
+                all_links = await collect_cards(page, 'a[href*="job"], a[href*="position"], a[href*="opening"]')
                 for link_elem in all_links:
                     try:
-                        href = await link_elem.get_attribute("href")
-                        text = await link_elem.inner_text()
+                        href = link_elem["href"]
+                        text = link_elem["text"]
                         if text and len(text.strip()) > 3:
                             jobs.append({
                                 "title": text.strip().split('\n')[0],
@@ -104,19 +105,9 @@ async def scrape_okx() -> List[Dict]:
 
         except Exception as e:
             print(f"OKX 抓取出错: {e}")
-        finally:
-            await browser.close()
 
     # 去重
-    seen = set()
-    unique_jobs = []
-    for job in jobs:
-        key = (job["title"], job.get("location", ""))
-        if key not in seen:
-            seen.add(key)
-            unique_jobs.append(job)
-
-    return unique_jobs
+    return dedupe_jobs(jobs)
 
 
 if __name__ == "__main__":
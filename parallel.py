@@ -0,0 +1,107 @@
+"""
+多进程筛选与渲染
+
+职位数量很大时，把筛选 (关键词匹配) 和按公司渲染 HTML 拆成批次交给 ProcessPoolExecutor:
+- 只把需要的字段打包成元组发给子进程，返回值也只有命中行的下标和结果
+- 按批次顺序合并，输出与单进程版本完全一致
+- 自动选择进程数；数据量小时直接在本进程执行，省掉进程池开销
+"""
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .filters import classify, filter_jobs
+from .render import group_by_company, render_company_section, render_page, write_html
+
+
+# 少于该数量的职位直接单进程处理 (进程启动和序列化的开销比省下的时间多)
+PARALLEL_MIN_JOBS = 200_000
+
+# 每个批次至少包含的职位数
+MIN_CHUNK_SIZE = 20_000
+
+# 渲染时发给子进程的字段 (其余字段不参与渲染，不必序列化)
+RENDER_FIELDS = ("id", "title", "url", "location", "team", "match_reason", "posted_date", "stale")
+
+
+def choose_workers(count: int, workers: Optional[int] = None) -> int:
+    """workers 为 None 或 0 时按数据量和 CPU 核数自动选择"""
+    if workers:
+        return max(1, workers)
+    if count < PARALLEL_MIN_JOBS:
+        return 1
+    return max(1, min(os.cpu_count() or 1, count // MIN_CHUNK_SIZE))
+
+
+def _executor(workers: int) -> ProcessPoolExecutor:
+    # 用 spawn 避免在有 Playwright / asyncio 线程的进程里 fork
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _chunks(count: int, workers: int) -> List[Tuple[int, int]]:
+    """把 [0, count) 切成大约 workers * 4 个批次，便于负载均衡"""
+    size = max(MIN_CHUNK_SIZE, math.ceil(count / (workers * 4)))
+    return [(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+def _classify_batch(rows: List[Tuple[str, str, str]]) -> List[Tuple[int, str, str, str, bool]]:
+    """子进程: 对一批 (location, title, team) 分类，只返回命中行"""
+    matches = []
+    for i, (location, title, team) in enumerate(rows):
+        reason, loc = classify(location, title, team)
+        if reason:
+            matches.append((i, reason, loc.country, loc.city, loc.remote))
+    return matches
+
+
+def _render_batch(company: str, jobs: List[Dict]) -> str:
+    """子进程: 渲染一个公司的区块"""
+    return render_company_section(company, jobs)
+
+
+def filter_jobs_parallel(jobs: List[Dict], workers: Optional[int] = None) -> List[Dict]:
+    """与 filter_jobs 结果相同，数据量大时分批多进程执行"""
+    workers = choose_workers(len(jobs), workers)
+    if workers <= 1:
+        return filter_jobs(jobs)
+
+    chunks = _chunks(len(jobs), workers)
+    batches = [
+        [(job.get("location", ""), job.get("title", ""), job.get("team", "")) for job in jobs[start:end]]
+        for start, end in chunks
+    ]
+
+    filtered = []
+    with _executor(workers) as pool:
+        # map 按提交顺序返回，合并结果是确定的
+        for (start, _), matches in zip(chunks, pool.map(_classify_batch, batches)):
+            for i, reason, country, city, remote in matches:
+                job = jobs[start + i]
+                job["country"] = country
+                job["city"] = city
+                job["remote"] = remote
+                job["match_reason"] = reason
+                filtered.append(job)
+    return filtered
+
+
+def generate_html_parallel(jobs: List[Dict], output_path: str, workers: Optional[int] = None,
+                           version: Optional[int] = None):
+    """与 generate_html 输出相同，公司区块在子进程中渲染"""
+    workers = choose_workers(len(jobs), workers)
+    jobs_by_company = group_by_company(jobs)
+    companies = list(jobs_by_company)
+
+    if workers <= 1 or len(companies) <= 1:
+        sections = [render_company_section(c, jobs_by_company[c]) for c in companies]
+    else:
+        batches = [
+            [{field: job[field] for field in RENDER_FIELDS if field in job} for job in jobs_by_company[c]]
+            for c in companies
+        ]
+        with _executor(min(workers, len(companies))) as pool:
+            sections = list(pool.map(_render_batch, companies, batches))
+
+    write_html(render_page(jobs, companies, sections, version), output_path)
@@ -0,0 +1,139 @@
+"""
+数据源注册表
+
+每个爬虫模块在顶层声明一个字面量字典 SOURCE，例如:
+
+    SOURCE = {
+        "name": "Binance",
+        "entry": "scrape_binance",
+        "strategies": {"browser": "scrape_binance"},
+        "requires": ["playwright"],
+        "order": 10,
+    }
+
+注册表只用 ast 读取这些声明，不会导入爬虫模块本身，
+playwright / aiohttp 等依赖在第一次真正抓取时才加载。
+新增一个交易所只需要在本目录下新增一个带 SOURCE 的模块。
+"""
+import ast
+import importlib
+import importlib.util
+import inspect
+import os
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 未声明 budget 时使用的单站点预算 (秒)
+DEFAULT_BUDGET = 4 * 60
+
+
+@dataclass(frozen=True)
+class Source:
+    """一个招聘数据源的声明"""
+    name: str
+    module: str
+    entry: str
+    strategies: Dict[str, str] = field(default_factory=dict, hash=False, compare=False)
+    requires: Tuple[str, ...] = ()
+    budget: float = DEFAULT_BUDGET
+    order: int = 100
+    # 探测地址: 自适应调度时先对它发条件请求，判断是否需要全量抓取
+    probe: str = ""
+
+    def missing_requirements(self) -> List[str]:
+        """返回未安装的依赖，只查找不导入"""
+        return [req for req in self.requires if importlib.util.find_spec(req) is None]
+
+    def load(self, strategy: Optional[str] = None) -> Callable[..., Awaitable[List[Dict]]]:
+        """导入爬虫模块并返回入口函数 (或指定策略的函数)"""
+        attr = self.strategies[strategy] if strategy else self.entry
+        module = importlib.import_module(f".{self.module}", __package__)
+        return getattr(module, attr)
+
+    async def scrape(self, **kwargs) -> List[Dict]:
+        """
+        懒加载后执行抓取
+
+        kwargs 可以带共享的 browser / session，入口函数不接受的参数会被忽略。
+        抓取期间 open_page() 使用本数据源的浏览器配置目录。
+        """
+        from .browser import current_profile
+        from .jobset import normalize_jobs
+
+        func = self.load()
+        params = inspect.signature(func).parameters
+        token = current_profile.set(self.name)
+        try:
+            return normalize_jobs(await func(**{k: v for k, v in kwargs.items() if k in params}))
+        finally:
+            current_profile.reset(token)
+
+
+def _read_declaration(path: str) -> Optional[Dict]:
+    """从模块源码中取出顶层 SOURCE 字面量"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+
+    # 快速跳过没有声明的模块，避免解析整个文件
+    if "\nSOURCE = " not in text:
+        return None
+
+    tree = ast.parse(text, filename=path)
+
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and len(node.targets) == 1
+            and isinstance(node.targets[0], ast.Name)
+            and node.targets[0].id == "SOURCE"
+        ):
+            return ast.literal_eval(node.value)
+    return None
+
+
+@lru_cache(maxsize=1)
+def discover_sources() -> Tuple[Source, ...]:
+    """扫描包目录，按 order 返回所有已声明的数据源"""
+    sources = []
+    for filename in sorted(os.listdir(PACKAGE_DIR)):
+        if not filename.endswith(".py") or filename.startswith("_"):
+            continue
+        decl = _read_declaration(os.path.join(PACKAGE_DIR, filename))
+        if not decl:
+            continue
+        sources.append(Source(
+            name=decl["name"],
+            module=filename[:-3],
+            entry=decl["entry"],
+            strategies=dict(decl.get("strategies", {})),
+            requires=tuple(decl.get("requires", ())),
+            budget=float(decl.get("budget", DEFAULT_BUDGET)),
+            order=int(decl.get("order", 100)),
+            probe=decl.get("probe", ""),
+        ))
+
+    return tuple(sorted(sources, key=lambda s: (s.order, s.name)))
+
+
+def get_source(name: str) -> Source:
+    """按名称 (不区分大小写) 查找数据源"""
+    for source in discover_sources():
+        if source.name.lower() == name.lower():
+            return source
+    known = ", ".join(s.name for s in discover_sources())
+    raise KeyError(f"Unknown source '{name}' (known: {known})")
+
+
+def select_sources(only: Optional[Iterable[str]] = None, skip: Optional[Iterable[str]] = None) -> List[Source]:
+    """根据 --only / --skip 选择数据源，未知名称会抛出 KeyError"""
+    only_names = {get_source(n).name for n in only} if only else None
+    skip_names = {get_source(n).name for n in skip} if skip else set()
+
+    return [
+        source for source in discover_sources()
+        if (only_names is None or source.name in only_names) and source.name not in skip_names
+    ]
@@ -0,0 +1,584 @@
+"""
+HTML 页面渲染
+
+页面由固定的外壳和每个公司一个的职位区块组成，公司区块可以单独渲染
+(parallel 模式下在子进程中渲染后再按顺序拼接)。
+带 feed 版本号生成时，页面会在 localStorage 中维护职位副本，按 feed/ 下的增量更新，
+页面本身被缓存时也能显示最新结果。
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+# 按增量同步 localStorage 副本，发现比页面更新的版本时在浏览器端重绘职位列表
+FEED_SCRIPT = """
+        const FEED_VERSION = __FEED_VERSION__;
+        const FEED_URL = 'feed/';
+        const FEED_STORE = 'jobs-feed';
+
+        async function fetchFeed(name) {
+            const resp = await fetch(FEED_URL + name, {cache: 'no-cache'});
+            if (!resp.ok) throw new Error(name + ': ' + resp.status);
+            return resp.json();
+        }
+
+        function loadLocalFeed() {
+            try {
+                return JSON.parse(localStorage.getItem(FEED_STORE));
+            } catch (e) {
+                return null;
+            }
+        }
+
+        function applyDelta(local, delta) {
+            delta.removed.forEach(id => delete local.jobs[id]);
+            delta.added.concat(delta.changed).forEach(job => local.jobs[job.id] = job);
+            local.version = delta.to;
+        }
+
+        async function syncFeed() {
+            const info = await fetchFeed('version.json');
+            let local = loadLocalFeed();
+            if (local && local.version === info.version) return local;
+
+            // 没有本地副本或落后太多: 先取全量快照
+            if (!local || local.version < info.since_from || local.version > info.version) {
+                const snapshot = await fetchFeed('snapshot-' + info.snapshot + '.json');
+                local = {version: snapshot.version, jobs: {}};
+                snapshot.jobs.forEach(job => local.jobs[job.id] = job);
+            }
+            if (local.version < info.version) {
+                applyDelta(local, await fetchFeed('since-' + local.version + '.json'));
+            }
+            try {
+                localStorage.setItem(FEED_STORE, JSON.stringify(local));
+            } catch (e) {
+                // 超出配额时只是下次需要重新下载
+            }
+            return local;
+        }
+
+        function escapeHtml(value) {
+            return String(value).replace(/[&<>"']/g, ch => ({
+                '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+            })[ch]);
+        }
+
+        function renderCard(job) {
+            const reason = job.match_reason || '';
+            const tag = (cls, text) => text ? `<span class="job-tag ${cls}">${escapeHtml(text)}</span>` : '';
+            return `<div class="job-card" data-type="${reason.includes('Hong Kong') ? 'hk' : 'graduate'}" data-id="${job.id}">
+                <h3 class="job-title"><a href="${escapeHtml(job.url || '#')}" target="_blank" rel="noopener">${escapeHtml(job.title || 'Unknown Position')}</a></h3>
+                <div class="job-meta">
+                    ${tag('tag-location', job.location || 'N/A')}${tag('tag-team', job.team)}${tag('tag-date', job.posted_date)}${tag('tag-reason', reason)}
+                    ${job.stale ? '<span class="job-tag tag-stale" title="Source failed this run, showing last known listing">Cached</span>' : ''}
+                </div>
+            </div>`;
+        }
+
+        function renderJobs(jobs) {
+            const byCompany = new Map();
+            jobs.forEach(job => {
+                const company = job.company || 'Unknown';
+                if (!byCompany.has(company)) byCompany.set(company, []);
+                byCompany.get(company).push(job);
+            });
+
+            const container = document.getElementById('jobs-container');
+            container.innerHTML = jobs.length ? [...byCompany].map(([company, companyJobs]) => `
+                <div class="company-section" data-company="${escapeHtml(company.toLowerCase())}">
+                    <div class="company-header">
+                        <h2 class="company-name">${escapeHtml(company)}</h2>
+                        <span class="company-count">${companyJobs.length} positions</span>
+                    </div>
+                    <div class="job-grid">${companyJobs.map(renderCard).join('')}</div>
+                </div>`).join('') : '<div class="no-jobs"><h2>No matching jobs found</h2><p>Check back later for new opportunities</p></div>';
+
+            const counts = document.querySelectorAll('.stat-number');
+            counts[0].textContent = jobs.length;
+            counts[1].textContent = jobs.filter(j => (j.match_reason || '').includes('Hong Kong')).length;
+            counts[2].textContent = jobs.filter(j => (j.match_reason || '').includes('Graduate')).length;
+        }
+
+        syncFeed().then(local => {
+            if (local.version > FEED_VERSION) {
+                renderJobs(Object.values(local.jobs));
+            }
+        }).catch(() => {});
+"""
+
+
+def group_by_company(jobs: List[Dict]) -> Dict[str, List[Dict]]:
+    """按公司分组，保持首次出现的顺序"""
+    jobs_by_company = {}
+    for job in jobs:
+        company = job.get("company", "Unknown")
+        if company not in jobs_by_company:
+            jobs_by_company[company] = []
+        jobs_by_company[company].append(job)
+    return jobs_by_company
+
+
+def generate_html(jobs: List[Dict], output_path: str, version: Optional[int] = None):
+    """生成 HTML 展示页面，version 为对应的 feed 版本"""
+    # 按公司分组
+    jobs_by_company = group_by_company(jobs)
+    sections = [
+        render_company_section(company, company_jobs)
+        for company, company_jobs in jobs_by_company.items()
+    ]
+    write_html(render_page(jobs, list(jobs_by_company), sections, version), output_path)
+
+
+def write_html(html_content: str, output_path: str):
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(html_content)
+
+
+def render_company_section(company: str, company_jobs: List[Dict]) -> str:
+    """渲染单个公司的职位区块"""
+    html_content = f'''            <div class="company-section" data-company="{company.lower()}">
+                <div class="company-header">
+                    <h2 class="company-name">{company}</h2>
+                    <span class="company-count">{len(company_jobs)} positions</span>
+                </div>
+                <div class="job-grid">
+'''
+    for job in company_jobs:
+        reason_class = "hk" if "Hong Kong" in job.get("match_reason", "") else "graduate"
+        data_id = f' data-id="{job["id"]}"' if job.get("id") else ""
+        html_content += f'''                    <div class="job-card" data-type="{reason_class}"{data_id}>
+                        <h3 class="job-title">
+                            <a href="{job.get('url', '#')}" target="_blank" rel="noopener">{job.get('title', 'Unknown Position')}</a>
+                        </h3>
+                        <div class="job-meta">
+                            <span class="job-tag tag-location">{job.get('location', 'N/A')}</span>
+                            {f'<span class="job-tag tag-team">{job.get("team")}</span>' if job.get('team') else ''}
+                            {f'<span class="job-tag tag-date">{job.get("posted_date")}</span>' if job.get('posted_date') else ''}
+                            <span class="job-tag tag-reason">{job.get('match_reason', '')}</span>
+                            {'<span class="job-tag tag-stale" title="Source failed this run, showing last known listing">Cached</span>' if job.get('stale') else ''}
+                        </div>
+                    </div>
+'''
+    html_content += '''                </div>
+            </div>
+'''
+    return html_content
+
+
+def render_page(jobs: List[Dict], companies: List[str], sections: List[str], version: Optional[int] = None) -> str:
+    """拼出完整页面，sections 为按 companies 顺序渲染好的公司区块"""
+    update_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    html_content = f'''<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Crypto Jobs - HK & Graduate Positions</title>
+    <link rel="preconnect" href="https://fonts.googleapis.com">
+    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600&family=Space+Grotesk:wght@500;700&display=swap" rel="stylesheet">
+    <style>
+        :root {{
+            --bg-color: #050505;
+            --card-bg: #0a0a0a;
+            --card-border: #1f1f1f;
+            --text-primary: #ededed;
+            --text-secondary: #a1a1aa;
+            --accent-start: #3b82f6;
+            --accent-end: #8b5cf6;
+            --hover-border: #3f3f46;
+        }}
+
+        * {{
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }}
+
+        body {{
+            font-family: 'Inter', sans-serif;
+            background-color: var(--bg-color);
+            background-image: 
+                radial-gradient(circle at 15% 50%, rgba(59, 130, 246, 0.08), transparent 25%),
+                radial-gradient(circle at 85% 30%, rgba(139, 92, 246, 0.08), transparent 25%);
+            min-height: 100vh;
+            color: var(--text-primary);
+            padding: 40px 20px;
+            line-height: 1.6;
+        }}
+
+        .container {{
+            max-width: 1200px;
+            margin: 0 auto;
+        }}
+
+        header {{
+            text-align: center;
+            margin-bottom: 60px;
+            position: relative;
+        }}
+
+        h1 {{
+            font-family: 'Space Grotesk', sans-serif;
+            font-size: 3.5rem;
+            font-weight: 700;
+            letter-spacing: -0.05em;
+            background: linear-gradient(135deg, #fff 30%, #a1a1aa);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom: 16px;
+        }}
+
+        .subtitle {{
+            color: var(--text-secondary);
+            font-size: 1.1rem;
+            max-width: 600px;
+            margin: 0 auto;
+        }}
+
+        .update-time {{
+            display: inline-block;
+            margin-top: 16px;
+            padding: 4px 12px;
+            border-radius: 9999px;
+            background: rgba(255, 255, 255, 0.03);
+            border: 1px solid rgba(255, 255, 255, 0.05);
+            color: #71717a;
+            font-size: 0.75rem;
+            font-family: 'Space Grotesk', sans-serif;
+        }}
+
+        .stats {{
+            display: grid;
+            grid-template-columns: repeat(3, 1fr);
+            gap: 20px;
+            margin-bottom: 60px;
+            max-width: 800px;
+            margin-left: auto;
+            margin-right: auto;
+        }}
+
+        .stat-item {{
+            background: rgba(255, 255, 255, 0.02);
+            border: 1px solid var(--card-border);
+            padding: 24px;
+            border-radius: 16px;
+            text-align: center;
+            transition: all 0.3s ease;
+        }}
+
+        .stat-item:hover {{
+            border-color: var(--hover-border);
+            transform: translateY(-2px);
+        }}
+
+        .stat-number {{
+            font-family: 'Space Grotesk', sans-serif;
+            font-size: 2.5rem;
+            font-weight: 700;
+            color: #fff;
+            margin-bottom: 4px;
+        }}
+
+        .stat-label {{
+            color: var(--text-secondary);
+            font-size: 0.875rem;
+            text-transform: uppercase;
+            letter-spacing: 0.05em;
+        }}
+
+        .filters {{
+            display: flex;
+            justify-content: center;
+            gap: 12px;
+            margin-bottom: 50px;
+            flex-wrap: wrap;
+        }}
+
+        .filter-btn {{
+            padding: 10px 24px;
+            border: 1px solid var(--card-border);
+            border-radius: 9999px;
+            background: transparent;
+            color: var(--text-secondary);
+            font-family: 'Space Grotesk', sans-serif;
+            font-weight: 500;
+            cursor: pointer;
+            transition: all 0.3s ease;
+        }}
+
+        .filter-btn:hover {{
+            border-color: #fff;
+            color: #fff;
+        }}
+
+        .filter-btn.active {{
+            background: #fff;
+            color: #000;
+            border-color: #fff;
+        }}
+
+        .company-section {{
+            margin-bottom: 60px;
+            animation: fadeIn 0.5s ease-out;
+        }}
+
+        .company-header {{
+            display: flex;
+            align-items: baseline;
+            gap: 16px;
+            margin-bottom: 24px;
+            padding-left: 8px;
+            border-left: 2px solid var(--accent-start);
+        }}
+
+        .company-name {{
+            font-family: 'Space Grotesk', sans-serif;
+            font-size: 1.75rem;
+            color: #fff;
+            font-weight: 600;
+        }}
+
+        .company-count {{
+            color: var(--text-secondary);
+            font-size: 0.9rem;
+        }}
+
+        .job-grid {{
+            display: grid;
+            grid-template-columns: repeat(auto-fill, minmax(340px, 1fr));
+            gap: 20px;
+        }}
+
+        .job-card {{
+            background: var(--card-bg);
+            border: 1px solid var(--card-border);
+            border-radius: 16px;
+            padding: 24px;
+            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+            position: relative;
+            overflow: hidden;
+            display: flex;
+            flex-direction: column;
+            justify-content: space-between;
+        }}
+
+        .job-card::before {{
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            width: 100%;
+            height: 100%;
+            background: linear-gradient(135deg, rgba(59, 130, 246, 0.05), rgba(139, 92, 246, 0.05));
+            opacity: 0;
+            transition: opacity 0.3s ease;
+        }}
+
+        .job-card:hover {{
+            transform: translateY(-4px);
+            border-color: var(--hover-border);
+            box-shadow: 0 20px 40px -15px rgba(0, 0, 0, 0.5);
+        }}
+
+        .job-card:hover::before {{
+            opacity: 1;
+        }}
+
+        .job-title {{
+            font-size: 1.1rem;
+            font-weight: 500;
+            margin-bottom: 16px;
+            line-height: 1.4;
+            position: relative;
+            z-index: 1;
+        }}
+
+        .job-title a {{
+            color: #fff;
+            text-decoration: none;
+            transition: color 0.2s;
+        }}
+
+        .job-title a:hover {{
+            color: #60a5fa;
+        }}
+
+        .job-meta {{
+            display: flex;
+            flex-wrap: wrap;
+            gap: 8px;
+            position: relative;
+            z-index: 1;
+            margin-top: auto;
+        }}
+
+        .job-tag {{
+            padding: 6px 12px;
+            border-radius: 6px;
+            font-size: 0.75rem;
+            font-weight: 500;
+            letter-spacing: 0.02em;
+        }}
+
+        .tag-location {{
+            background: rgba(59, 130, 246, 0.1);
+            color: #60a5fa;
+            border: 1px solid rgba(59, 130, 246, 0.2);
+        }}
+
+        .tag-team {{
+            background: rgba(139, 92, 246, 0.1);
+            color: #a78bfa;
+            border: 1px solid rgba(139, 92, 246, 0.2);
+        }}
+
+        .tag-reason {{
+            background: rgba(16, 185, 129, 0.1);
+            color: #34d399;
+            border: 1px solid rgba(16, 185, 129, 0.2);
+        }}
+
+        .tag-date {{
+            background: rgba(255, 255, 255, 0.03);
+            color: var(--text-secondary);
+            border: 1px solid var(--card-border);
+        }}
+
+        .tag-stale {{
+            background: rgba(245, 158, 11, 0.1);
+            color: #fbbf24;
+            border: 1px solid rgba(245, 158, 11, 0.2);
+        }}
+
+        .no-jobs {{
+            text-align: center;
+            padding: 80px 20px;
+            color: var(--text-secondary);
+        }}
+
+        footer {{
+            text-align: center;
+            padding: 60px 20px;
+            color: #52525b;
+            font-size: 0.875rem;
+            border-top: 1px solid var(--card-border);
+            margin-top: 60px;
+        }}
+
+        @keyframes fadeIn {{
+            from {{ opacity: 0; transform: translateY(10px); }}
+            to {{ opacity: 1; transform: translateY(0); }}
+        }}
+
+        @media (max-width: 768px) {{
+            h1 {{ font-size: 2.5rem; }}
+            .stats {{ grid-template-columns: 1fr; }}
+            .container {{ padding: 20px; }}
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <header>
+            <h1>Crypto Jobs Aggregator</h1>
+            <p class="subtitle">Hong Kong & Graduate Positions | Binance, OKX, Bitget</p>
+            <p class="update-time">Last updated: {update_time}</p>
+        </header>
+
+        <div class="stats">
+            <div class="stat-item">
+                <div class="stat-number">{len(jobs)}</div>
+                <div class="stat-label">Total Positions</div>
+            </div>
+            <div class="stat-item">
+                <div class="stat-number">{len([j for j in jobs if 'Hong Kong' in j.get('match_reason', '')])}</div>
+                <div class="stat-label">Hong Kong</div>
+            </div>
+            <div class="stat-item">
+                <div class="stat-number">{len([j for j in jobs if 'Graduate' in j.get('match_reason', '')])}</div>
+                <div class="stat-label">Graduate</div>
+            </div>
+        </div>
+
+        <div class="filters">
+            <button class="filter-btn active" onclick="filterJobs('all')">All</button>
+            <button class="filter-btn" onclick="filterJobs('hk')">Hong Kong</button>
+            <button class="filter-btn" onclick="filterJobs('graduate')">Graduate</button>
+'''
+
+    # 添加公司筛选按钮
+    for company in companies:
+        html_content += f'            <button class="filter-btn" onclick="filterJobs(\'{company.lower()}\')">{company}</button>\n'
+
+    html_content += '''        </div>
+
+        <main id="jobs-container">
+'''
+
+    if not jobs:
+        html_content += '''            <div class="no-jobs">
+                <h2>No matching jobs found</h2>
+                <p>Check back later for new opportunities</p>
+            </div>
+'''
+    else:
+        html_content += "".join(sections)
+
+    html_content += '''        </main>
+
+        <footer>
+            <p>Auto-updated daily via GitHub Actions</p>
+            <p>Data sourced from official career pages</p>
+        </footer>
+    </div>
+
+    <script>
+        function filterJobs(type) {
+            // Update button states
+            document.querySelectorAll('.filter-btn').forEach(btn => {
+                btn.classList.remove('active');
+                if (btn.textContent.toLowerCase() === type ||
+                    (type === 'all' && btn.textContent === 'All') ||
+                    (type === 'hk' && btn.textContent === 'Hong Kong') ||
+                    (type === 'graduate' && btn.textContent === 'Graduate')) {
+                    btn.classList.add('active');
+                }
+            });
+
+            // Filter jobs
+            const sections = document.querySelectorAll('.company-section');
+            const cards = document.querySelectorAll('.job-card');
+
+            if (type === 'all') {
+                sections.forEach(s => s.style.display = 'block');
+                cards.forEach(c => c.style.display = 'block');
+            } else if (type === 'hk' || type === 'graduate') {
+                sections.forEach(s => s.style.display = 'block');
+                cards.forEach(card => {
+                    card.style.display = card.dataset.type === type ? 'block' : 'none';
+                });
+                // Hide empty sections
+                sections.forEach(section => {
+                    const visibleCards = section.querySelectorAll('.job-card[style="display: block"]');
+                    section.style.display = visibleCards.length > 0 ? 'block' : 'none';
+                });
+            } else {
+                // Company filter
+                sections.forEach(section => {
+                    section.style.display = section.dataset.company === type ? 'block' : 'none';
+                });
+                cards.forEach(c => c.style.display = 'block');
+            }
+        }
+'''
+    if version is not None:
+        html_content += FEED_SCRIPT.replace("__FEED_VERSION__", str(version))
+
+    html_content += '''    </script>
+</body>
+</html>'''
+
+    return html_content
@@ -0,0 +1,174 @@
+"""
+抓取调度器
+
+为每个网站的抓取调用加上:
+1. 全局运行截止时间 (workflow 有 15 分钟上限)
+2. 单站点时间预算
+3. 有限次数的重试，带抖动的指数退避
+4. 最终失败时复用上一次的成功结果，并标记为过期 (stale)
+
+站点的最终结果 (而不是每次尝试) 记入浏览器配置的健康状态。
+"""
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .browser import record_profile_result
+from .jobset import split_posted_team
+
+
+# 整次运行的截止时间 (秒)，给 workflow 的 15 分钟留出生成和提交的余量
+RUN_DEADLINE = 12 * 60
+
+# 单站点默认预算 (秒)，包含所有重试；各数据源可在 SOURCE 声明中覆盖
+DEFAULT_SITE_BUDGET = 4 * 60
+
+# 每个站点最多尝试次数
+MAX_ATTEMPTS = 3
+
+# 退避基数 (秒)，第 n 次重试前等待 BACKOFF_BASE * 2^(n-1) * [0.5, 1.5)
+BACKOFF_BASE = 5.0
+
+# 剩余时间少于该值时不再发起新的尝试
+MIN_ATTEMPT_TIME = 20.0
+
+
+ScrapeFunc = Callable[[], Awaitable[List[Dict]]]
+
+
+@dataclass
+class SiteResult:
+    """单个站点的调度结果"""
+    name: str
+    jobs: List[Dict] = field(default_factory=list)
+    # ok: 本次抓取成功; stale: 失败后复用上次结果; failed: 失败且无可复用结果;
+    # skipped: 本次未选中，沿用上次结果
+    status: str = "failed"
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: str = ""
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE) -> float:
+    """第 attempt 次失败后的等待时间，带 ±50% 抖动"""
+    return base * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+
+def load_previous_jobs(json_path: str) -> Dict[str, List[Dict]]:
+    """读取上一次输出的 jobs.json，按公司分组"""
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    previous: Dict[str, List[Dict]] = {}
+    for job in data.get("jobs", []):
+        previous.setdefault(job.get("company", "Unknown"), []).append(split_posted_team(job))
+    return previous
+
+
+def mark_stale(jobs: List[Dict], error: str) -> List[Dict]:
+    """复制上次的结果并标记为过期"""
+    stale_jobs = []
+    for job in jobs:
+        job = dict(job)
+        job["stale"] = True
+        job.setdefault("stale_since", datetime.now().isoformat())
+        job["stale_reason"] = error
+        stale_jobs.append(job)
+    return stale_jobs
+
+
+async def run_site(
+    name: str,
+    scrape: ScrapeFunc,
+    deadline: float,
+    budget: float,
+    previous: Optional[List[Dict]] = None,
+    max_attempts: int = MAX_ATTEMPTS,
+    allow_empty: bool = False,
+) -> SiteResult:
+    """
+    在预算内抓取单个站点
+
+    超时、异常和空结果都视为失败并重试 (爬虫内部吞掉异常后会返回空列表)。
+    """
+    result = SiteResult(name=name)
+    missing_dependency = False
+    start = time.monotonic()
+    site_deadline = min(deadline, start + budget)
+
+    while result.attempts < max_attempts:
+        remaining = site_deadline - time.monotonic()
+        if remaining < MIN_ATTEMPT_TIME:
+            result.error = result.error or "deadline reached"
+            break
+
+        result.attempts += 1
+        try:
+            jobs = await asyncio.wait_for(scrape(), timeout=remaining)
+            if jobs or allow_empty:
+                result.jobs = jobs
+                result.status = "ok"
+                result.error = ""
+                break
+            result.error = "no jobs returned"
+        except asyncio.TimeoutError:
+            result.error = f"timed out after {remaining:.0f}s"
+        except ImportError as e:
+            # 缺少依赖不是临时故障，重试没有意义
+            result.error = f"missing dependency: {e}"
+            missing_dependency = True
+            break
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+
+        if result.attempts >= max_attempts:
+            break
+
+        delay = backoff_delay(result.attempts)
+        if time.monotonic() + delay + MIN_ATTEMPT_TIME > site_deadline:
+            break
+        print(f"  - {name}: attempt {result.attempts} failed ({result.error}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    # 一次运行只记一次，重试中的临时失败不会提前删掉配置目录；缺少依赖与配置无关，不记
+    if not missing_dependency:
+        record_profile_result(name, result.status == "ok")
+
+    if result.status != "ok" and previous:
+        result.jobs = mark_stale(previous, result.error)
+        result.status = "stale"
+
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+async def run_sites(
+    sites: Dict[str, ScrapeFunc],
+    previous: Optional[Dict[str, List[Dict]]] = None,
+    run_deadline: float = RUN_DEADLINE,
+    budgets: Optional[Dict[str, float]] = None,
+    max_attempts: int = MAX_ATTEMPTS,
+) -> List[SiteResult]:
+    """并发调度所有站点，结果顺序与 sites 一致"""
+    previous = previous or {}
+    budgets = budgets or {}
+    deadline = time.monotonic() + run_deadline
+
+    return await asyncio.gather(*[
+        run_site(
+            name,
+            scrape,
+            deadline=deadline,
+            budget=budgets.get(name, DEFAULT_SITE_BUDGET),
+            previous=previous.get(name),
+            max_attempts=max_attempts,
+        )
+        for name, scrape in sites.items()
+    ])
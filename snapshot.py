@@ -0,0 +1,102 @@
+"""
+原始抓取结果快照
+
+每次抓取后把未筛选的各站点结果写入 .cache/raw/raw-<时间>.json (不提交，随 .cache 跨运行恢复)，
+之后可以用 --from-snapshot 直接加载快照，只跑筛选和输出，
+调整关键词或 HTML 模板时不需要重新启动浏览器。
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .jobset import normalize_jobs
+
+
+# 快照格式版本，结构变化时递增
+SNAPSHOT_VERSION = 1
+
+# 保留的快照数量
+KEEP_SNAPSHOTS = 14
+
+SNAPSHOT_PREFIX = "raw-"
+
+
+def list_snapshots(snapshot_dir: str) -> List[str]:
+    """按时间从旧到新返回快照路径"""
+    try:
+        names = os.listdir(snapshot_dir)
+    except OSError:
+        return []
+    return [
+        os.path.join(snapshot_dir, name)
+        for name in sorted(names)
+        if name.startswith(SNAPSHOT_PREFIX) and name.endswith(".json")
+    ]
+
+
+def save_snapshot(results, snapshot_dir: str, keep: int = KEEP_SNAPSHOTS) -> str:
+    """保存调度结果 (SiteResult 列表) 为快照，并清理旧快照"""
+    os.makedirs(snapshot_dir, exist_ok=True)
+    now = datetime.now()
+
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": now.isoformat(),
+        "sources": {
+            result.name: {
+                "status": result.status,
+                "attempts": result.attempts,
+                "elapsed": round(result.elapsed, 2),
+                "error": result.error,
+                "jobs": result.jobs,
+            }
+            for result in results
+        },
+    }
+
+    path = os.path.join(snapshot_dir, f"{SNAPSHOT_PREFIX}{now.strftime('%Y%m%dT%H%M%S')}.json")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+    for old in list_snapshots(snapshot_dir)[:-keep]:
+        os.remove(old)
+
+    return path
+
+
+def load_snapshot(path: str) -> Dict:
+    """读取快照，版本不兼容时抛出 ValueError"""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    version = data.get("version")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version {version} in {path} (expected {SNAPSHOT_VERSION})")
+    # 旧快照里可能还有未整理的字段
+    for source in data["sources"].values():
+        normalize_jobs(source["jobs"])
+    return data
+
+
+def resolve_snapshot(path_or_latest: str, snapshot_dir: str) -> str:
+    """把 'latest' 解析为最新快照路径"""
+    if path_or_latest != "latest":
+        return path_or_latest
+    snapshots = list_snapshots(snapshot_dir)
+    if not snapshots:
+        raise FileNotFoundError(f"No snapshots found in {snapshot_dir}")
+    return snapshots[-1]
+
+
+def load_latest_jobs(snapshot_dir: str) -> Optional[Dict[str, List[Dict]]]:
+    """返回最新快照中各站点的原始职位，没有可用快照时返回 None"""
+    for path in reversed(list_snapshots(snapshot_dir)):
+        try:
+            data = load_snapshot(path)
+        except (OSError, ValueError):
+            continue
+        return {name: source["jobs"] for name, source in data["sources"].items() if source["jobs"]}
+    return None
@@ -0,0 +1,269 @@
+"""
+分布式抓取任务队列
+
+coordinator 把每个数据源作为一个任务写入 SQLite 队列，多个 worker (可以是多个进程，
+也可以是挂载同一目录的多台机器) 领取任务执行:
+
+1. 领取任务时加租约 (lease)，执行期间定期续租 (heartbeat)
+2. worker 崩溃或失联后租约过期，任务会被其他 worker 重新领取
+3. 同一任务被领取超过 MAX_LEASES 次仍未完成则标记失败，避免反复拖垮 worker
+4. 结果 (SiteResult) 以 JSON 写回队列，coordinator 按入队顺序合并
+
+爬虫在一个浏览器会话里自行翻页，所以任务粒度是数据源而不是单页。
+"""
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict
+from typing import Dict, Iterator, List, Optional
+
+from .registry import Source, get_source
+from .scheduler import SiteResult, mark_stale, run_site
+
+
+# 租约时长 (秒)，worker 每 LEASE_SECONDS / 3 续租一次
+LEASE_SECONDS = 60
+
+# 单个任务最多被领取的次数
+MAX_LEASES = 3
+
+# worker 没领到任务时的轮询间隔，以及 coordinator 检查进度的间隔 (秒)
+POLL_INTERVAL = 2.0
+
+# worker 连续空闲多久后退出 (秒)
+IDLE_TIMEOUT = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    -- pending / leased / done / failed / cancelled
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    lease_until REAL,
+    leases INTEGER NOT NULL DEFAULT 0,
+    deadline REAL NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (status, lease_until);
+CREATE INDEX IF NOT EXISTS tasks_run ON tasks (run_id, position);
+"""
+
+
+def new_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class WorkQueue:
+    """基于 SQLite 的任务队列，所有状态变更都在 BEGIN IMMEDIATE 事务中完成"""
+
+    def __init__(self, path: str, lease_seconds: float = LEASE_SECONDS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, sources: List[Source], run_deadline: float) -> str:
+        """为本次运行入队所有数据源，返回 run_id"""
+        run_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO tasks (run_id, source, position, deadline, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, source.name, i, now + run_deadline, now, now) for i, source in enumerate(sources)],
+            )
+        return run_id
+
+    def claim(self, worker: str) -> Optional[sqlite3.Row]:
+        """领取一个待执行或租约已过期的任务"""
+        now = time.time()
+        with self.transaction() as conn:
+            # 租约过期且已领取次数用尽的任务直接判为失败
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired too many times', updated_at = ?"
+                " WHERE status = 'leased' AND lease_until < ? AND leases >= ?",
+                (now, now, MAX_LEASES),
+            )
+            row = conn.execute(
+                "SELECT * FROM tasks"
+                " WHERE deadline > ? AND (status = 'pending' OR (status = 'leased' AND lease_until < ?))"
+                " ORDER BY created_at, position LIMIT 1",
+                (now, now),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, leases = leases + 1,"
+                " updated_at = ? WHERE id = ?",
+                (worker, now + self.lease_seconds, now, row["id"]),
+            )
+        return row
+
+    def heartbeat(self, task_id: int, worker: str) -> bool:
+        """续租，返回 False 表示租约已被别人接手"""
+        now = time.time()
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_until = ?, updated_at = ?"
+                " WHERE id = ? AND worker = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, task_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: int, worker: str, result: SiteResult) -> bool:
+        """写回结果；租约已丢失时丢弃 (任务已被重新领取)"""
+        status = "done" if result.status == "ok" else "failed"
+        now = time.time()
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = ?, result = ?, error = ?, updated_at = ?"
+                " WHERE id = ? AND worker = ? AND status = 'leased'",
+                (status, json.dumps(asdict(result), ensure_ascii=False), result.error, now, task_id, worker),
+            )
+        return cursor.rowcount == 1
+
+    def cancel(self, run_id: str) -> int:
+        """截止时间到时取消未完成的任务，返回取消数量"""
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'cancelled', error = 'run deadline reached', updated_at = ?"
+                " WHERE run_id = ? AND status IN ('pending', 'leased')",
+                (time.time(), run_id),
+            )
+        return cursor.rowcount
+
+    def progress(self, run_id: str) -> Dict[str, int]:
+        rows = self.conn.execute(
+            "SELECT status, COUNT(*) AS n FROM tasks WHERE run_id = ? GROUP BY status", (run_id,)
+        ).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def results(self, run_id: str) -> List[sqlite3.Row]:
+        return self.conn.execute(
+            "SELECT * FROM tasks WHERE run_id = ? ORDER BY position", (run_id,)
+        ).fetchall()
+
+    def purge(self, keep_seconds: float = 7 * 24 * 3600) -> int:
+        """删除早于 keep_seconds 的任务，防止队列文件无限增长"""
+        with self.transaction() as conn:
+            cursor = conn.execute("DELETE FROM tasks WHERE created_at < ?", (time.time() - keep_seconds,))
+        return cursor.rowcount
+
+
+async def _keep_lease(queue: WorkQueue, task_id: int, worker: str):
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        if not queue.heartbeat(task_id, worker):
+            return
+
+
+async def run_task(queue: WorkQueue, task: sqlite3.Row, worker: str) -> SiteResult:
+    """执行一个已领取的任务并写回结果"""
+    name = task["source"]
+    # 截止时间在队列里是墙钟时间，换算成本机的 monotonic 时间
+    deadline = time.monotonic() + (task["deadline"] - time.time())
+    heartbeat = asyncio.ensure_future(_keep_lease(queue, task["id"], worker))
+    try:
+        try:
+            source = get_source(name)
+        except KeyError:
+            result = SiteResult(name=name, error="unknown source on this worker")
+        else:
+            # 过期回退由 coordinator 统一处理，这里不传 previous
+            result = await run_site(name, source.scrape, deadline=deadline, budget=source.budget)
+    finally:
+        heartbeat.cancel()
+
+    if not queue.complete(task["id"], worker, result):
+        print(f"  - {name}: lease lost, result discarded")
+    return result
+
+
+async def run_worker(
+    queue: WorkQueue,
+    worker: Optional[str] = None,
+    concurrency: int = 1,
+    idle_timeout: float = IDLE_TIMEOUT,
+) -> int:
+    """
+    循环领取并执行任务，空闲超过 idle_timeout 后退出，返回完成的任务数
+
+    concurrency 为本 worker 同时执行的任务数 (每个任务各自启动浏览器)。
+    """
+    worker = worker or new_worker_id()
+    completed = 0
+
+    async def loop():
+        nonlocal completed
+        idle_since = time.monotonic()
+        while time.monotonic() - idle_since < idle_timeout:
+            task = queue.claim(worker)
+            if task is None:
+                await asyncio.sleep(POLL_INTERVAL)
+                continue
+            print(f"[{worker}] {task['source']}: lease {task['leases'] + 1}")
+            result = await run_task(queue, task, worker)
+            print(f"[{worker}] {task['source']}: {result.status} "
+                  f"({len(result.jobs)} jobs, {result.elapsed:.0f}s{', ' + result.error if result.error else ''})")
+            completed += 1
+            idle_since = time.monotonic()
+
+    await asyncio.gather(*[loop() for _ in range(max(1, concurrency))])
+    return completed
+
+
+async def wait_for_run(queue: WorkQueue, run_id: str, timeout: float) -> Dict[str, int]:
+    """等待本次运行的任务全部结束；超时则取消剩余任务"""
+    deadline = time.monotonic() + timeout
+    while True:
+        progress = queue.progress(run_id)
+        if not progress.get("pending") and not progress.get("leased"):
+            return progress
+        if time.monotonic() >= deadline:
+            queue.cancel(run_id)
+            return queue.progress(run_id)
+        await asyncio.sleep(POLL_INTERVAL)
+
+
+def merge_results(queue: WorkQueue, run_id: str, previous: Optional[Dict[str, List[Dict]]] = None) -> List[SiteResult]:
+    """按入队顺序合并 worker 写回的结果，失败或未完成的数据源回退到上次结果"""
+    previous = previous or {}
+    results = []
+    for row in queue.results(run_id):
+        if row["result"]:
+            result = SiteResult(**json.loads(row["result"]))
+        else:
+            result = SiteResult(name=row["source"], attempts=row["leases"], error=row["error"] or row["status"])
+
+        if result.status != "ok" and previous.get(result.name):
+            result.jobs = mark_stale(previous[result.name], result.error)
+            result.status = "stale"
+        results.append(result)
+    return results